@@ -1,7 +1,7 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import pickle
 import json
+import numpy as np
 import os
 import secrets
 import subprocess
@@ -12,8 +12,17 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from functools import wraps
 from db import init_db, create_user_from_json, authenticate_user_from_json, get_user_by_id, get_saved_players, save_player, remove_saved_player
-from live_games import get_todays_games, get_upcoming_games
+from live_games import SCHEDULE_URL, SCOREBOARD_URL, cache_stamp, get_todays_games, get_upcoming_games
 from recommendations import get_top_performers
+from leaders import DEFAULT_LEADERS, MAX_LEADERS, STATS, stat_name
+from player_store import decode_cursor, encode_cursor, parse_sort, parse_where
+from player_search import AUTOCOMPLETE_LIMIT, MAX_EDIT_DISTANCE
+from player_similarity import DEFAULT_NEIGHBORS, MAX_NEIGHBORS
+from player_summaries import SUMMARY_FIELDS, encode_json, expand_fields
+from response_cache import cached_response
+from compression import compress_response
+from dataset import dataset
+from serialization import MSGPACK_MIMETYPE, FastJSONProvider, api_response, response_format
 
 
 
@@ -26,6 +35,7 @@ except ImportError as e:
     AI_AVAILABLE = False
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 
 AO = os.environ.get('ALLOWED_ORIGINS', 'http://localhost:5173').split(',')
 CORS(app, resources={
@@ -45,7 +55,23 @@ active_tokens = {}
 
 mysql = None
 
-nba_data = None
+
+def data_version():
+    """Version of the loaded season, or None before anything is loaded."""
+    return dataset.version
+
+def schedule_version():
+    """Data version plus the fetch time of the cached schedule, while it is fresh."""
+    stamp = cache_stamp(SCHEDULE_URL)
+    return None if stamp is None else (data_version(), stamp)
+
+def scoreboard_version():
+    """Data version plus the fetch time of the cached live scoreboard, while it is fresh."""
+    stamp = cache_stamp(SCOREBOARD_URL)
+    return None if stamp is None else (data_version(), stamp)
+
+def _unsearched():
+    return not request.args.get('search', '').strip() and not request.args.get('where', '').strip()
 
 def create_token(user_id: int) -> str:
     token = secrets.token_urlsafe(32)
@@ -97,22 +123,24 @@ def sanitize_string(value: str, max_length: int = 100) -> str:
 
 # ── Replace the live games routes in app.py with these ──────────────────────
 # Import at top of app.py:
-#   from live_games import get_todays_games, get_upcoming_games, get_top_pra_player
+#   from live_games import SCHEDULE_URL, SCOREBOARD_URL, cache_stamp, get_todays_games, get_upcoming_games
 
 @app.route('/api/games/today', methods=['GET'])
+@cached_response(scoreboard_version, max_age=10)
 def get_today_games():
     try:
-        games = get_todays_games(nba_data=nba_data)
-        return jsonify({'games': games, 'count': len(games)}), 200
+        games = get_todays_games()
+        return api_response({'games': games, 'count': len(games)})
     except Exception as e:
         print(f"Error fetching today's games: {e}")
         return jsonify({'error': 'Failed to fetch games', 'games': []}), 500
 
 @app.route('/api/games/upcoming', methods=['GET'])
+@cached_response(schedule_version, max_age=30)
 def get_upcoming():
     try:
         days = int(request.args.get('days', 7))
-        games = get_upcoming_games(days=min(days, 14), nba_data=nba_data)
+        games = get_upcoming_games(days=min(days, 14))
         return jsonify({'games': games, 'count': len(games)}), 200
     except Exception as e:
         print(f"Error fetching upcoming games: {e}")
@@ -121,7 +149,7 @@ def get_upcoming():
 @app.route('/api/games/<string:game_id>', methods=['GET'])
 def get_game_detail(game_id):
     try:
-        games = get_todays_games(nba_data=nba_data)
+        games = get_todays_games()
         game = next((g for g in games if g['gameId'] == game_id), None)
         if not game:
             return jsonify({'error': 'Game not found'}), 404
@@ -131,9 +159,11 @@ def get_game_detail(game_id):
         return jsonify({'error': 'Failed to fetch game'}), 500
 
 @app.route('/api/stats/top-pra', methods=['GET'])
+@cached_response(data_version)
 def get_top_pra():
     try:
-        player = get_top_pra_player(nba_data)
+        store = dataset.store
+        player = store.leaders.top_pra_player() if store else None
         if not player:
             return jsonify({'error': 'No data available'}), 404
         return jsonify(player), 200
@@ -154,70 +184,150 @@ def validate_pagination(page: any, limit: any) -> tuple:
     
     return page, limit
 
-def load_nba_data():
-    global nba_data
-    try:
-        with open('nba_2025_26_data.pkl', 'rb') as f:
-            nba_data = pickle.load(f)
-        print(f"Loaded {len(nba_data)} NBA players from pickle file")
-        return True
-    except FileNotFoundError:
-        print("NBA data file 'nba_2025_26_data.pkl' not found.")
-        return False
-    except Exception as e:
-        print(f"Error loading NBA data: {e}")
-        return False
-
-def _deterministic_trend(name, stat, scale=3.0):
-    """Generate a stable, deterministic trend value based on player name + stat."""
-    import hashlib
-    seed = int(hashlib.md5(f"{name}_{stat}".encode()).hexdigest(), 16)
-    raw = ((seed % 10000) / 10000.0) * 2 - 1
-    return round(raw * scale, 1)
-
-def _deterministic_consistency(name, ppg):
-    """Generate a stable consistency score (0.0 – 1.0) based on name + ppg."""
-    import hashlib
-    seed = int(hashlib.md5(f"{name}_consistency".encode()).hexdigest(), 16)
-    base = (seed % 1000) / 1000.0
-    ppg_bonus = min(ppg / 40.0, 0.3) if ppg else 0
-    return round(min(1.0, base * 0.7 + ppg_bonus + 0.15), 2)
-
-def get_player_stats_summary(player_data):
-    ppg_current = player_data.get('PPG_LAST', player_data.get('ppg_last', 0))
-    apg_current = player_data.get('APG_LAST', player_data.get('apg_last', 0))
-    rpg_current = player_data.get('RPG_LAST', player_data.get('rpg_last', 0))
-    name = player_data.get('PLAYER_NAME', player_data.get('player_name', 'Unknown'))
-
-    ppg_trend = player_data.get('PPG_TREND', _deterministic_trend(name, 'ppg', scale=min(ppg_current * 0.25, 4.0)))
-    apg_trend = player_data.get('APG_TREND', _deterministic_trend(name, 'apg', scale=min(apg_current * 0.3, 2.0)))
-    rpg_trend = player_data.get('RPG_TREND', _deterministic_trend(name, 'rpg', scale=min(rpg_current * 0.25, 2.0)))
-    consistency = player_data.get('CONSISTENCY_SCORE', _deterministic_consistency(name, ppg_current))
-
-    return {
-        'id': player_data.get('PLAYER_ID', player_data.get('player_id', abs(hash(name)) % (10**9))),
-        'name': name,
-        'team': player_data.get('TEAM', player_data.get('team', 'UNK')),
-        'position': player_data.get('POSITION', player_data.get('position', 'UNK')),
-        'age': player_data.get('AGE', player_data.get('age', 0)),
-        'stats': {
-            'ppg_last': round(ppg_current, 1),
-            'apg_last': round(apg_current, 1),
-            'rpg_last': round(rpg_current, 1),
-            'spg_last': round(player_data.get('SPG_LAST', player_data.get('spg_last', 0)), 1),
-            'bpg_last': round(player_data.get('BPG_LAST', player_data.get('bpg_last', 0)), 1),
-            'fg_pct_last': round(player_data.get('FG_PCT_LAST', player_data.get('fg_pct_last', 0)) * 100, 1),
-            'fg3_pct_last': round(player_data.get('FG3_PCT_LAST', player_data.get('fg3_pct_last', 0)) * 100, 1),
-            'ft_pct_last': round(player_data.get('FT_PCT_LAST', player_data.get('ft_pct_last', 0)) * 100, 1),
-            'games_played': int(player_data.get('GAMES_PLAYED_LAST', player_data.get('games_played_last', 0)) or 0)
+def requested_fields():
+    """Summary paths selected by `fields=`, or None for full summaries; plus an error response."""
+    raw = sanitize_string(request.args.get('fields', ''), 500)
+    fields = [f.strip().lower() for f in raw.split(',') if f.strip()]
+    if not fields:
+        return None, None
+    paths, unknown = expand_fields(fields)
+    if unknown:
+        return None, (jsonify({
+            'error': f"Unknown fields: {', '.join(unknown)}",
+            'allowed_fields': list(SUMMARY_FIELDS)
+        }), 400)
+    return paths, None
+
+def _cursor_page(store, mask, spec, cursor, limit, filters, fields):
+    """/api/players in cursor mode: resume after the row the cursor names."""
+    if cursor:
+        decoded = decode_cursor(cursor)
+        if not decoded:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        sort_by, descending, after = decoded
+    else:
+        if len(spec) > 1:
+            return jsonify({'error': 'Cursor pagination supports a single sort_by key'}), 400
+        (sort_by, descending), after = spec[0], None
+    
+    rows, has_more = store.keyset_page(mask, sort_by, descending, after, limit)
+    next_cursor = None
+    if has_more and len(rows):
+        last = int(rows[-1])
+        next_cursor = encode_cursor(sort_by, descending, store.sort_value(sort_by, last), int(store.ids[last]))
+    
+    return api_response({
+        'players': store.summaries_for(rows, fields),
+        'pagination': {
+            'limit': limit,
+            'total': int(np.count_nonzero(mask)),
+            'next_cursor': next_cursor,
+            'has_more': has_more,
+            'sort_by': sort_by,
+            'sort_order': 'desc' if descending else 'asc'
         },
-        'trends': {
-            'ppg_trend': round(ppg_trend, 1),
-            'apg_trend': round(apg_trend, 1),
-            'rpg_trend': round(rpg_trend, 1),
-            'consistency_score': round(consistency, 2)
-        }
+        'filters': filters
+    })
+
+def set_nba_data(records):
+    """Publish `records` as the live season (sample data, tests)."""
+    dataset.publish(records)
+
+def load_nba_data():
+    return dataset.load()
+
+def start_data_watcher():
+    return dataset.start_watcher()
+
+# Served when the season file is missing, so the API still comes up.
+SAMPLE_PLAYERS = [
+    {
+        'PLAYER_ID': 1,
+        'PLAYER_NAME': 'LeBron James',
+        'TEAM': 'LAL',
+        'POSITION': 'SF',
+        'AGE': 39,
+        'HEIGHT': 80,
+        'WEIGHT': 250,
+        'PPG_LAST': 25.0,
+        'APG_LAST': 7.8,
+        'RPG_LAST': 7.3,
+        'SPG_LAST': 1.3,
+        'BPG_LAST': 0.5,
+        'FG_PCT_LAST': 0.525,
+        'FG3_PCT_LAST': 0.410,
+        'FT_PCT_LAST': 0.730,
+        'GAMES_PLAYED_LAST': 71,
+        'PPG_TREND': 0.5,
+        'APG_TREND': 0.2,
+        'RPG_TREND': 0.1,
+        'CONSISTENCY_SCORE': 0.85
+    },
+    {
+        'PLAYER_ID': 2,
+        'PLAYER_NAME': 'Stephen Curry',
+        'TEAM': 'GSW',
+        'POSITION': 'PG',
+        'AGE': 35,
+        'HEIGHT': 75,
+        'WEIGHT': 190,
+        'PPG_LAST': 26.4,
+        'APG_LAST': 4.5,
+        'RPG_LAST': 4.5,
+        'SPG_LAST': 0.9,
+        'BPG_LAST': 0.4,
+        'FG_PCT_LAST': 0.450,
+        'FG3_PCT_LAST': 0.427,
+        'FT_PCT_LAST': 0.923,
+        'GAMES_PLAYED_LAST': 74,
+        'PPG_TREND': 1.2,
+        'APG_TREND': -0.1,
+        'RPG_TREND': 0.3,
+        'CONSISTENCY_SCORE': 0.92
     }
+]
+
+_configured = False
+
+def configure_app(watch_data: bool = True) -> Flask:
+    """Load the season, its indexes and the AI model into `app`, and return it.
+
+    The routes live on this module's `app`, so there is only ever one app to
+    configure; calls after the first return it untouched rather than loading
+    everything again or starting a second watcher.
+
+    wsgi.py calls this once in the gunicorn master (preload_app), so every
+    forked worker shares the loaded data copy-on-write.  The master then
+    owns the data watcher (see gunicorn.conf.py), hence `watch_data=False`.
+    """
+    global _configured
+    if _configured:
+        return app
+    _configured = True
+
+    init_db()
+
+    print("Loading NBA data...")
+    if load_nba_data():
+        print(f"NBA data loaded - {len(dataset.records)} players")
+        for i, player in enumerate(dataset.records[:5]):
+            print(f"  {i+1}. {player['PLAYER_NAME']} ({player['TEAM']}) - {player['PPG_LAST']:.1f} PPG")
+    else:
+        set_nba_data(SAMPLE_PLAYERS)
+        print(f"Using sample data - {len(dataset.records)} players")
+    dataset.warm()
+
+    if AI_AVAILABLE:
+        try:
+            print("Initializing AI system...")
+            initialize_nba_ai()
+            print("AI system initialized")
+        except Exception as e:
+            print(f"AI initialization failed: {e}")
+
+    if watch_data:
+        start_data_watcher()
+    return app
 
 @app.after_request
 def add_security_headers(response):
@@ -227,6 +337,10 @@ def add_security_headers(response):
     response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
     return response
 
+@app.after_request
+def compress_large_responses(response):
+    return compress_response(response, request.accept_encodings)
+
 @app.route('/api/auth/signup', methods=['POST'])
 def signup():
     try:
@@ -306,15 +420,22 @@ def root():
         'endpoints': {
             'health': '/api/health',
             'all_players': '/api/players',
+            'player_facets': '/api/players/facets',
             'player_by_id': '/api/players/<id>',
+            'player_percentiles': '/api/players/<id>/percentiles',
+            'similar_players': '/api/players/<id>/similar?k=<k>',
+            'players_batch': '/api/players/batch?ids=<id>,<id>',
             'search_player': '/api/players/search/<name>',
+            'autocomplete': '/api/autocomplete?q=<prefix>',
             'teams': '/api/teams',
+            'team': '/api/teams/<tricode>',
+            'team_compare': '/api/teams/compare?a=<tricode>&b=<tricode>',
             'positions': '/api/positions',
             'ai_predictions': '/api/ai-predictions',
             'player_prediction': '/api/player-prediction/<name>',
             'stat_leaders': '/api/stats/leaders'
         },
-        'players_loaded': len(nba_data) if nba_data else 0,
+        'players_loaded': len(dataset.store) if dataset.store else 0,
         'ai_available': AI_AVAILABLE
     })
 
@@ -324,29 +445,15 @@ def health_check():
         'status': 'healthy',
         'message': 'NBA API server is running',
         'ai_available': AI_AVAILABLE,
-        'players_loaded': len(nba_data) if nba_data else 0,
+        'players_loaded': len(dataset.store) if dataset.store else 0,
         'database_connected': False
     })
 
-SORT_KEY_MAP = {
-    'name': ('PLAYER_NAME', str),
-    'team': ('TEAM', str),
-    'position': ('POSITION', str),
-    'ppg': ('PPG_LAST', float),
-    'apg': ('APG_LAST', float),
-    'rpg': ('RPG_LAST', float),
-    'spg': ('SPG_LAST', float),
-    'bpg': ('BPG_LAST', float),
-    'fg_pct': ('FG_PCT_LAST', float),
-    'fg3_pct': ('FG3_PCT_LAST', float),
-    'ft_pct': ('FT_PCT_LAST', float),
-    'games': ('GAMES_PLAYED_LAST', float),
-    'age': ('AGE', float),
-}
-
 @app.route('/api/players', methods=['GET'])
+@cached_response(data_version, when=_unsearched)
 def get_all_players():
-    if not nba_data:
+    store = dataset.store
+    if not store:
         return jsonify({'error': 'NBA data not loaded'}), 500
     
     page = request.args.get('page', 1)
@@ -359,98 +466,304 @@ def get_all_players():
     sort_by = request.args.get('sort_by', 'name')
     sort_order = request.args.get('sort_order', 'asc')
 
-    filtered_players = list(nba_data)
+    where = request.args.get('where', '').strip()
+
+    fields, error = requested_fields()
+    if error:
+        return error
+    try:
+        conditions = parse_where(where)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if search:
-        filtered_players = [p for p in filtered_players if search in p['PLAYER_NAME'].lower()]
+    mask = store.filter_mask(search, team, position)
+    if conditions:
+        mask &= store.where_mask(conditions)
+    spec = parse_sort(sort_by, sort_order)
+    filters = {'search': search, 'team': team, 'position': position}
+    if where:
+        filters['where'] = where
     
-    if team:
-        filtered_players = [p for p in filtered_players if p['TEAM'] == team]
+    # Any `cursor` arg (an empty one starts from the top) switches to keyset paging.
+    if 'cursor' in request.args:
+        return _cursor_page(store, mask, spec, request.args.get('cursor', '').strip(), limit, filters, fields)
     
-    if position:
-        filtered_players = [p for p in filtered_players if p['POSITION'] == position]
-
-    raw_key, cast = SORT_KEY_MAP.get(sort_by, ('PLAYER_NAME', str))
-    reverse = (sort_order == 'desc')
-    try:
-        if cast is str:
-            filtered_players.sort(key=lambda p: (p.get(raw_key) or '').lower(), reverse=reverse)
-        else:
-            filtered_players.sort(key=lambda p: cast(p.get(raw_key) or 0), reverse=reverse)
-    except Exception:
-        pass
+    rows = store.ordered_rows(mask, spec)
 
     start_idx = (page - 1) * limit
     end_idx = start_idx + limit
-    page_players = filtered_players[start_idx:end_idx]
+    page_rows = rows[start_idx:end_idx]
+    pagination = {
+        'page': page,
+        'limit': limit,
+        'total': len(rows),
+        'total_pages': (len(rows) + limit - 1) // limit
+    }
+    if response_format() == MSGPACK_MIMETYPE:
+        return api_response({
+            'players': store.summaries_for(page_rows, fields),
+            'pagination': pagination,
+            'filters': filters
+        })
+
+    if fields is None:
+        players_json = b','.join(store.summary_json[i] for i in page_rows)
+    else:
+        players_json = b','.join(encode_json(p) for p in store.summaries_for(page_rows, fields))
+    
+    # Summaries are pre-encoded at load time, so the page body is assembled
+    # from bytes; keys are written in the sorted order jsonify would use.
+    body = b''.join((
+        b'{"filters":', encode_json(filters),
+        b',"pagination":', encode_json(pagination),
+        b',"players":[', players_json,
+        b']}\n',
+    ))
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept')
+    return response
+
+@app.route('/api/players/facets', methods=['GET'])
+@cached_response(data_version, when=_unsearched)
+def get_player_facets():
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
+    
+    search = sanitize_string(request.args.get('search', ''), 50).lower()
+    team = sanitize_string(request.args.get('team', ''), 10).upper()
+    position = sanitize_string(request.args.get('position', ''), 10).upper()
+    
+    facets = store.facet_counts(search, team, position)
+    facets['filters'] = {'search': search, 'team': team, 'position': position}
+    return jsonify(facets)
+
+MAX_BATCH_IDS_GET = 100
+MAX_BATCH_IDS_POST = 1000
+
+@app.route('/api/players/batch', methods=['GET', 'POST'])
+def get_players_batch():
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
     
-    players_summary = [get_player_stats_summary(player) for player in page_players]
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        raw_ids = data.get('ids') if isinstance(data, dict) else None
+        if not isinstance(raw_ids, list):
+            return jsonify({'error': 'Body must be JSON like {"ids": [...]}'}), 400
+        max_ids = MAX_BATCH_IDS_POST
+    else:
+        raw_ids = [i for i in request.args.get('ids', '').split(',') if i.strip()]
+        max_ids = MAX_BATCH_IDS_GET
+    
+    if not raw_ids:
+        return jsonify({'error': 'ids is required'}), 400
+    fields, error = requested_fields()
+    if error:
+        return error
+    if len(raw_ids) > max_ids:
+        return jsonify({'error': f'At most {max_ids} ids per request'}), 400
+    
+    player_ids = []
+    for raw_id in raw_ids:
+        try:
+            player_ids.append(int(str(raw_id).strip()))
+        except ValueError:
+            player_ids.append(None)
+    rows = store.index.rows_for_ids(player_ids)
+    found = iter(store.summaries_for([row for row in rows if row is not None], fields))
+    
+    players = []
+    not_found = []
+    for raw_id, player_id, row in zip(raw_ids, player_ids, rows):
+        if player_id is None:
+            players.append({'id': raw_id, 'error': 'Invalid player ID'})
+        elif row is None:
+            players.append({'id': player_id, 'error': 'Player not found'})
+            not_found.append(player_id)
+        else:
+            players.append(next(found))
     
     return jsonify({
-        'players': players_summary,
-        'pagination': {
-            'page': page,
-            'limit': limit,
-            'total': len(filtered_players),
-            'total_pages': (len(filtered_players) + limit - 1) // limit
-        },
-        'filters': {
-            'search': search,
-            'team': team,
-            'position': position
-        }
+        'players': players,
+        'found': len(players) - sum(1 for p in players if 'error' in p),
+        'not_found': not_found
     })
 
 @app.route('/api/players/<int:player_id>', methods=['GET'])
 def get_player_by_id(player_id):
-    if not nba_data:
+    store = dataset.store
+    if not store:
         return jsonify({'error': 'NBA data not loaded'}), 500
     
-    if player_id < 0 or player_id > 9999999:
+    if player_id < 0:
         return jsonify({'error': 'Invalid player ID'}), 400
     
-    player = next((p for p in nba_data if p['PLAYER_ID'] == player_id), None)
-    if not player:
+    fields, error = requested_fields()
+    if error:
+        return error
+    
+    row = store.index.row_for_id(player_id)
+    if row is None:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    return jsonify(store.summaries_for([row], fields)[0])
+
+@app.route('/api/players/<int:player_id>/percentiles', methods=['GET'])
+@cached_response(data_version)
+def get_player_percentiles(player_id):
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
+    
+    row = store.index.row_for_id(player_id)
+    if row is None:
         return jsonify({'error': 'Player not found'}), 404
     
-    return jsonify(get_player_stats_summary(player))
+    summary = store.summaries[row]
+    return jsonify({
+        'id': summary['id'],
+        'name': summary['name'],
+        'team': summary['team'],
+        'position': summary['position'],
+        'percentiles': summary['percentiles']
+    })
+
+@app.route('/api/players/<int:player_id>/similar', methods=['GET'])
+@cached_response(data_version)
+def get_similar_players(player_id):
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
+    
+    try:
+        k = min(max(int(request.args.get('k', DEFAULT_NEIGHBORS)), 1), MAX_NEIGHBORS)
+    except (ValueError, TypeError):
+        return jsonify({'error': 'k must be an integer'}), 400
+    
+    fields, error = requested_fields()
+    if error:
+        return error
+    
+    row = store.index.row_for_id(player_id)
+    if row is None:
+        return jsonify({'error': 'Player not found'}), 404
+    
+    neighbours = store.similarity.neighbours(row, k)
+    similar = []
+    for summary, (_, similarity) in zip(store.summaries_for([r for r, _ in neighbours], fields), neighbours):
+        similar.append({**summary, 'similarity': round(similarity, 3)})
+    
+    return jsonify({
+        'player': {'id': int(store.ids[row]), 'name': store.names[row]},
+        'similar': similar,
+        'k': k
+    })
 
 @app.route('/api/players/search/<string:player_name>', methods=['GET'])
 def search_player(player_name):
-    if not nba_data:
+    store = dataset.store
+    if not store:
         return jsonify({'error': 'NBA data not loaded'}), 500
     
     player_name_clean = sanitize_string(player_name, 50).lower()
     if not player_name_clean:
         return jsonify({'error': 'Invalid player name'}), 400
     
-    players = [p for p in nba_data if player_name_clean in p['PLAYER_NAME'].lower()]
+    fields, error = requested_fields()
+    if error:
+        return error
     
-    if not players:
+    # fuzzy=1 skips the substring match; otherwise fuzzy only kicks in when
+    # the substring match finds nobody, so typos still get an answer.
+    fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true', 'yes')
+    if not fuzzy:
+        rows = store.search_rows(player_name_clean)[:50]
+        if len(rows):
+            return jsonify({'players': store.summaries_for(rows, fields)})
+    
+    try:
+        max_distance = int(request.args.get('max_distance', MAX_EDIT_DISTANCE))
+    except (ValueError, TypeError):
+        max_distance = MAX_EDIT_DISTANCE
+    
+    matches = store.fuzzy_rows(player_name_clean, max_distance)
+    if not matches:
         return jsonify({'error': 'No players found'}), 404
     
-    players_summary = [get_player_stats_summary(player) for player in players[:50]]
-    return jsonify({'players': players_summary})
+    rows = [row for row, _ in matches]
+    players_summary = [
+        dict(summary, match_distance=distance)
+        for summary, (_, distance) in zip(store.summaries_for(rows, fields), matches)
+    ]
+    return jsonify({'players': players_summary, 'fuzzy': True})
+
+@app.route('/api/autocomplete', methods=['GET'])
+def autocomplete():
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
+    
+    query = sanitize_string(request.args.get('q', ''), 50)
+    try:
+        limit = min(max(int(request.args.get('limit', AUTOCOMPLETE_LIMIT)), 1), 20)
+    except (ValueError, TypeError):
+        limit = AUTOCOMPLETE_LIMIT
+    
+    return jsonify({'query': query, 'suggestions': store.autocomplete(query, limit)})
 
 @app.route('/api/teams', methods=['GET'])
+@cached_response(data_version)
 def get_teams():
-    if not nba_data:
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
+    
+    return jsonify({'teams': store.team_labels})
+
+@app.route('/api/teams/compare', methods=['GET'])
+@cached_response(data_version)
+def compare_teams():
+    store = dataset.store
+    if not store:
+        return jsonify({'error': 'NBA data not loaded'}), 500
+    teams = store.teams
+    
+    a = sanitize_string(request.args.get('a', ''), 10)
+    b = sanitize_string(request.args.get('b', ''), 10)
+    if not a or not b:
+        return jsonify({'error': 'Both a and b team tricodes are required'}), 400
+    
+    comparison = teams.compare(a, b)
+    if comparison is None:
+        return jsonify({'error': 'Team not found'}), 404
+    return jsonify(comparison)
+
+@app.route('/api/teams/<string:tricode>', methods=['GET'])
+@cached_response(data_version)
+def get_team(tricode):
+    store = dataset.store
+    if not store:
         return jsonify({'error': 'NBA data not loaded'}), 500
+    teams = store.teams
     
-    teams = list(set(player['TEAM'] for player in nba_data))
-    teams.sort()
-    return jsonify({'teams': teams})
+    summary = teams.summary(sanitize_string(tricode, 10))
+    if summary is None:
+        return jsonify({'error': 'Team not found'}), 404
+    return jsonify(summary)
 
 @app.route('/api/positions', methods=['GET'])
+@cached_response(data_version)
 def get_positions():
-    if not nba_data:
+    store = dataset.store
+    if not store:
         return jsonify({'error': 'NBA data not loaded'}), 500
     
-    positions = list(set(player['POSITION'] for player in nba_data))
-    positions.sort()
-    return jsonify({'positions': positions})
+    return jsonify({'positions': store.position_labels})
 
 @app.route('/api/ai-predictions', methods=['GET'])
+@cached_response(data_version, max_age=0)
 def get_ai_predictions():
     if not AI_AVAILABLE:
         return jsonify({
@@ -468,11 +781,11 @@ def get_ai_predictions():
             'breakout_players': get_breakout_players(10)
         }
         
-        if nba_data:
+        store = dataset.store
+        if store:
             for category in ['top_scorers', 'top_assists', 'top_rebounders']:
                 for player in predictions[category]:
-                    player_name = player['PLAYER_NAME']
-                    matching_player = next((p for p in nba_data if p['PLAYER_NAME'] == player_name), None)
+                    matching_player = store.record_for_name(player['PLAYER_NAME'])
                     if matching_player:
                         player['PPG_LAST'] = matching_player.get('PPG_LAST', 0)
                         player['APG_LAST'] = matching_player.get('APG_LAST', 0)
@@ -518,13 +831,33 @@ def get_player_prediction_api(player_name):
         }), 500
 
 @app.route('/api/stats/leaders', methods=['GET'])
+@cached_response(data_version)
 def get_stat_leaders():
-    if not nba_data:
+    store = dataset.store
+    if not store:
         return jsonify({'error': 'NBA data not loaded'}), 500
     
-    ppg_leaders = sorted(nba_data, key=lambda x: x['PPG_LAST'], reverse=True)[:10]
-    apg_leaders = sorted(nba_data, key=lambda x: x['APG_LAST'], reverse=True)[:10]
-    rpg_leaders = sorted(nba_data, key=lambda x: x['RPG_LAST'], reverse=True)[:10]
+    stat = request.args.get('stat', '').strip().lower()
+    if stat:
+        if stat not in STATS:
+            return jsonify({'error': f"Invalid stat. Use one of: {', '.join(STATS)}"}), 400
+        try:
+            n = min(max(int(request.args.get('n', DEFAULT_LEADERS)), 1), MAX_LEADERS)
+            min_games = max(int(request.args.get('min_games', 0)), 0)
+        except (ValueError, TypeError):
+            return jsonify({'error': 'n and min_games must be integers'}), 400
+        team = sanitize_string(request.args.get('team', ''), 10).upper()
+        position = sanitize_string(request.args.get('position', ''), 10).upper()
+        return jsonify({
+            'stat': stat,
+            'stat_name': stat_name(stat),
+            'leaders': store.leaders.leaderboard(stat, n, team, position, min_games),
+            'filters': {'team': team, 'position': position, 'min_games': min_games}
+        })
+    
+    ppg_leaders = store.rows(store.leaders.top('ppg'))
+    apg_leaders = store.rows(store.leaders.top('apg'))
+    rpg_leaders = store.rows(store.leaders.top('rpg'))
     
     def format_leaders(leaders, stat_key, stat_name):
         return [{
@@ -541,6 +874,7 @@ def get_stat_leaders():
     })
 
 @app.route('/api/recommendations/<stat>', methods=['GET'])
+@cached_response(data_version, max_age=0)
 def recommendations(stat):
     if not AI_AVAILABLE:
         return jsonify({'error': 'AI predictions not available', 'ai_available': False}), 503
@@ -551,7 +885,7 @@ def recommendations(stat):
 
     try:
         data = get_top_performers(stat_clean)
-        return jsonify(data), 200
+        return api_response(data)
     except Exception as e:
         print(f"Error in recommendations: {e}")
         import traceback
@@ -601,67 +935,7 @@ if __name__ == '__main__':
             except Exception as e:
                 print(f"Frontend startup failed: {e}")
         
-        print("\nLoading NBA data...")
-        if load_nba_data():
-            print(f"NBA data loaded - {len(nba_data)} players")
-            for i, player in enumerate(nba_data[:5]):
-                print(f"  {i+1}. {player['PLAYER_NAME']} ({player['TEAM']}) - {player['PPG_LAST']:.1f} PPG")
-        else:
-            nba_data = [
-                {
-                    'PLAYER_ID': 1,
-                    'PLAYER_NAME': 'LeBron James',
-                    'TEAM': 'LAL',
-                    'POSITION': 'SF',
-                    'AGE': 39,
-                    'HEIGHT': 80,
-                    'WEIGHT': 250,
-                    'PPG_LAST': 25.0,
-                    'APG_LAST': 7.8,
-                    'RPG_LAST': 7.3,
-                    'SPG_LAST': 1.3,
-                    'BPG_LAST': 0.5,
-                    'FG_PCT_LAST': 0.525,
-                    'FG3_PCT_LAST': 0.410,
-                    'FT_PCT_LAST': 0.730,
-                    'GAMES_PLAYED_LAST': 71,
-                    'PPG_TREND': 0.5,
-                    'APG_TREND': 0.2,
-                    'RPG_TREND': 0.1,
-                    'CONSISTENCY_SCORE': 0.85
-                },
-                {
-                    'PLAYER_ID': 2,
-                    'PLAYER_NAME': 'Stephen Curry',
-                    'TEAM': 'GSW',
-                    'POSITION': 'PG',
-                    'AGE': 35,
-                    'HEIGHT': 75,
-                    'WEIGHT': 190,
-                    'PPG_LAST': 26.4,
-                    'APG_LAST': 4.5,
-                    'RPG_LAST': 4.5,
-                    'SPG_LAST': 0.9,
-                    'BPG_LAST': 0.4,
-                    'FG_PCT_LAST': 0.450,
-                    'FG3_PCT_LAST': 0.427,
-                    'FT_PCT_LAST': 0.923,
-                    'GAMES_PLAYED_LAST': 74,
-                    'PPG_TREND': 1.2,
-                    'APG_TREND': -0.1,
-                    'RPG_TREND': 0.3,
-                    'CONSISTENCY_SCORE': 0.92
-                }
-            ]
-            print(f"Using sample data - {len(nba_data)} players")
-        
-        if AI_AVAILABLE:
-            try:
-                print("Initializing AI system...")
-                initialize_nba_ai()
-                print("AI system initialized")
-            except Exception as e:
-                print(f"AI initialization failed: {e}")
+        configure_app()
         
         print("\n" + "="*50)
         print("Starting NBA API server...")
@@ -672,7 +946,6 @@ if __name__ == '__main__':
         print("Press Ctrl+C to stop")
         print("="*50 + "\n")
         
-        init_db()
         app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
         
     except KeyboardInterrupt:
@@ -0,0 +1,52 @@
+"""
+ASGI entry point, for serving game nights without a thread per waiting client.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+Requests to /api/games/* first await the NBA feeds they need on the event
+loop (live_games_async), where concurrent requests share one upstream fetch
+per feed.  Every request is then handed to the Flask app, which finds those
+feeds in the shared cache and answers in a short worker-thread hop, so
+responses, caching headers and compression are the same as under WSGI.
+"""
+
+from a2wsgi import WSGIMiddleware
+
+import live_games_async
+from app import configure_app
+from live_games import SCHEDULE_URL
+
+GAMES_PREFIX = '/api/games/'
+
+
+flask_app = configure_app()
+# Flask runs on a2wsgi's thread pool; only the upstream feed fetches use the event loop.
+wsgi = WSGIMiddleware(flask_app)
+
+
+async def _warm_feeds(path: str):
+    if path == GAMES_PREFIX + 'upcoming':
+        await live_games_async.fetch(SCHEDULE_URL)
+    else:
+        # today and single-game lookups both read the scoreboard
+        await live_games_async.fetch_scoreboard()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await live_games_async.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD') and scope['path'].startswith(GAMES_PREFIX):
+        await _warm_feeds(scope['path'])
+    await wsgi(scope, receive, send)
@@ -0,0 +1,330 @@
+"""
+Memory-mapped columnar file format for the season player data.
+
+A `.cols` file sits next to the `.pkl` it was converted from:
+
+    b'NBACOLS1' | uint64 header length | JSON header | 64-byte aligned arrays
+
+Numeric fields are stored as raw float64/int64/uint8 arrays, string fields
+as int32 codes into a shared UTF-8 string table, and anything else as JSON
+text in that table.  Loading maps the file read-only, so worker processes
+share its pages through the OS cache and never unpickle anything: the
+PlayerStore is built from the mapped columns (float columns without a copy)
+and record dicts are only built for the rows legacy callers ask for.
+
+Convert existing pickles with:  python columnar_data.py nba_2025_26_data.pkl
+"""
+
+import json
+import os
+import pickle
+import struct
+import sys
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b'NBACOLS1'
+ALIGN = 64
+COLUMNAR_SUFFIX = '.cols'
+
+# per-row state of a field
+ABSENT, PRESENT, NONE = 0, 1, 2
+
+
+def columnar_path(path: str) -> str:
+    """The `.cols` file that belongs to a `.pkl` path."""
+    root, ext = os.path.splitext(path)
+    return path if ext == COLUMNAR_SUFFIX else root + COLUMNAR_SUFFIX
+
+
+def _kind(values: List) -> str:
+    if all(isinstance(v, bool) for v in values):
+        return 'bool'
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+        return 'int'
+    if all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values):
+        return 'float'
+    if all(isinstance(v, str) for v in values):
+        return 'str'
+    return 'json'
+
+
+def write_columnar(records: List[Dict], path: str):
+    """Write `records` to `path` as a .cols file (atomically, via a temp file)."""
+    names: List[str] = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                names.append(key)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        code = string_ids.get(text)
+        if code is None:
+            code = string_ids[text] = len(strings)
+            strings.append(text)
+        return code
+
+    blobs: List[Tuple[str, np.ndarray]] = []
+    columns = []
+    for name in names:
+        raw = [record.get(name) for record in records]
+        state = np.array([ABSENT if name not in r else (NONE if r[name] is None else PRESENT) for r in records],
+                         dtype=np.uint8)
+        present = [v for v in raw if v is not None]
+        kind = _kind(present)
+        if kind == 'bool':
+            values = np.array([bool(v) for v in raw], dtype=np.uint8)
+        elif kind == 'int':
+            values = np.array([0 if v is None else int(v) for v in raw], dtype=np.int64)
+        elif kind == 'float':
+            values = np.array([0.0 if v is None else float(v) for v in raw], dtype=np.float64)
+        elif kind == 'str':
+            values = np.array([-1 if v is None else intern(v) for v in raw], dtype=np.int32)
+        else:
+            values = np.array([-1 if v is None else intern(json.dumps(v)) for v in raw], dtype=np.int32)
+
+        column = {'name': name, 'kind': kind, 'values': len(blobs)}
+        blobs.append((f'{name}.values', values))
+        if kind == 'float':
+            # Rows that held ints in a mixed column, so they read back as ints.
+            ints = np.array([isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in raw],
+                            dtype=np.uint8)
+            if ints.any():
+                column['ints'] = len(blobs)
+                blobs.append((f'{name}.ints', ints))
+        if (state != PRESENT).any():
+            column['state'] = len(blobs)
+            blobs.append((f'{name}.state', state))
+        columns.append(column)
+
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    blobs.append(('strings.offsets', offsets))
+    blobs.append(('strings.data', np.frombuffer(b''.join(encoded), dtype=np.uint8)))
+
+    # Array offsets are relative to the first aligned byte after the header.
+    layout = []
+    position = 0
+    for _, array in blobs:
+        layout.append({'offset': position, 'dtype': array.dtype.str, 'count': int(array.size)})
+        position += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps({'rows': len(records), 'columns': columns, 'arrays': layout}).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<Q', len(header)) + header)
+        for (_, array), entry in zip(blobs, layout):
+            f.seek(data_start + entry['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + position)
+    os.replace(tmp_path, path)
+
+
+class ColumnarData:
+    """Read-only, memory-mapped view of a .cols file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f'{path} is not a columnar data file')
+        (header_length,) = struct.unpack('<Q', bytes(self._map[len(MAGIC):len(MAGIC) + 8]))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._map[start:start + header_length]).decode('utf-8'))
+        data_start = -(-(start + header_length) // ALIGN) * ALIGN
+
+        self.rows: int = header['rows']
+        self.columns: List[Dict] = header['columns']
+        self.names: List[str] = [c['name'] for c in self.columns]
+        self._by_name: Dict[str, Dict] = {c['name']: c for c in self.columns}
+        self._arrays = [
+            np.frombuffer(self._map, dtype=np.dtype(a['dtype']), count=a['count'], offset=data_start + a['offset'])
+            for a in header['arrays']
+        ]
+        offsets, data = self._arrays[-2], self._arrays[-1]
+        raw = data.tobytes()
+        bounds = offsets.tolist()
+        self.strings: List[str] = [raw[a:b].decode('utf-8') for a, b in zip(bounds, bounds[1:])]
+
+    def __len__(self):
+        return self.rows
+
+    def values(self, column: Dict) -> np.ndarray:
+        return self._arrays[column['values']]
+
+    def state(self, column: Dict) -> Optional[np.ndarray]:
+        return self._arrays[column['state']] if 'state' in column else None
+
+    def float_columns(self) -> Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Field name -> (float64 values, missing mask or None) for numeric fields.
+
+        float64 fields are returned as zero-copy views of the mapped file.
+        """
+        out = {}
+        for column in self.columns:
+            if column['kind'] not in ('float', 'int'):
+                continue
+            values = self.values(column)
+            state = self.state(column)
+            out[column['name']] = (
+                values if values.dtype == np.float64 else values.astype(np.float64),
+                None if state is None else state != PRESENT,
+            )
+        return out
+
+    def _python_values(self, column: Dict) -> List:
+        kind = column['kind']
+        values = self.values(column)
+        if kind == 'bool':
+            return [bool(v) for v in values.tolist()]
+        if kind == 'int':
+            return values.tolist()
+        if kind == 'float':
+            out = values.tolist()
+            if 'ints' in column:
+                for row in np.flatnonzero(self._arrays[column['ints']]).tolist():
+                    out[row] = int(out[row])
+            return out
+        if kind == 'str':
+            return [self.strings[code] if code >= 0 else None for code in values.tolist()]
+        return [json.loads(self.strings[code]) if code >= 0 else None for code in values.tolist()]
+
+    def _python_value(self, column: Dict, row: int):
+        kind = column['kind']
+        value = self.values(column)[row].item()
+        if kind == 'bool':
+            return bool(value)
+        if kind == 'float' and 'ints' in column and self._arrays[column['ints']][row]:
+            return int(value)
+        if kind == 'str':
+            return self.strings[value] if value >= 0 else None
+        if kind == 'json':
+            return json.loads(self.strings[value]) if value >= 0 else None
+        return value
+
+    def field(self, name: str, default=None) -> List:
+        """`record.get(name, default)` for every record, read from the column."""
+        column = self._by_name.get(name)
+        if column is None:
+            return [default] * self.rows
+        values = self._python_values(column)
+        state = self.state(column)
+        if state is None:
+            return values
+        return [value if flag == PRESENT else (None if flag == NONE else default)
+                for value, flag in zip(values, state.tolist())]
+
+    def record(self, row: int) -> Dict:
+        """The original dict of one row."""
+        record = {}
+        for column in self.columns:
+            state = self.state(column)
+            flag = PRESENT if state is None else state[row]
+            if flag == PRESENT:
+                record[column['name']] = self._python_value(column, row)
+            elif flag == NONE:
+                record[column['name']] = None
+        return record
+
+    def to_records(self) -> List[Dict]:
+        """The original list of player dicts, key order and value types included.
+
+        Builds every row at once; ColumnarRecords builds rows on demand.
+        """
+        records = [{} for _ in range(self.rows)]
+        for column in self.columns:
+            name = column['name']
+            values = self._python_values(column)
+            state = self.state(column)
+            if state is None:
+                for record, value in zip(records, values):
+                    record[name] = value
+                continue
+            for record, value, flag in zip(records, values, state.tolist()):
+                if flag == PRESENT:
+                    record[name] = value
+                elif flag == NONE:
+                    record[name] = None
+        return records
+
+
+class ColumnarRecords(Sequence):
+    """The records of a ColumnarData as a read-only sequence of dicts.
+
+    Rows are built when they are read, so serving from the mapped columns
+    never materializes the whole season; iterating builds every row once
+    and keeps them.
+    """
+
+    def __init__(self, data: ColumnarData):
+        self.data = data
+        self._all: Optional[List[Dict]] = None
+
+    def __len__(self):
+        return self.data.rows
+
+    def __getitem__(self, index):
+        if self._all is not None:
+            return self._all[index]
+        if isinstance(index, slice):
+            return [self.data.record(row) for row in range(*index.indices(self.data.rows))]
+        if index < 0:
+            index += self.data.rows
+        if not 0 <= index < self.data.rows:
+            raise IndexError('record index out of range')
+        return self.data.record(index)
+
+    def __iter__(self):
+        if self._all is None:
+            self._all = self.data.to_records()
+        return iter(self._all)
+
+
+def load_player_data(path: str) -> Tuple[Optional[Sequence], Optional[ColumnarData]]:
+    """Records for a season `.pkl` path, preferring its `.cols` file.
+
+    The columnar file is used when it exists and is at least as new as the
+    pickle; its records are a lazy ColumnarRecords.  A columnar file that
+    can't be read falls back to the pickle.  Returns (records, ColumnarData
+    or None), or (None, None) if neither file exists.
+    """
+    cols = columnar_path(path)
+    pkl_exists, cols_exists = os.path.exists(path), os.path.exists(cols)
+    if cols_exists and (not pkl_exists or os.stat(cols).st_mtime_ns >= os.stat(path).st_mtime_ns):
+        try:
+            data = ColumnarData(cols)
+            return ColumnarRecords(data), data
+        except (ValueError, KeyError, IndexError, struct.error) as e:
+            if not pkl_exists:
+                raise
+            print(f"Unreadable columnar file {cols} ({e}), reading the pickle instead")
+    if pkl_exists:
+        with open(path, 'rb') as f:
+            return pickle.load(f), None
+    return None, None
+
+
+def convert(pkl_path: str) -> str:
+    with open(pkl_path, 'rb') as f:
+        records = pickle.load(f)
+    out = columnar_path(pkl_path)
+    write_columnar(records, out)
+    return out
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python columnar_data.py <data.pkl> [<data.pkl> ...]')
+        sys.exit(1)
+    for pkl_path in sys.argv[1:]:
+        out = convert(pkl_path)
+        print(f"Converted {pkl_path} -> {out} ({os.path.getsize(out)} bytes)")
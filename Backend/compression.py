@@ -0,0 +1,53 @@
+"""
+Content-Encoding negotiation and compression for API responses.
+
+gzip is always available; brotli is used when the optional `brotli` package
+is installed and the client accepts it.  Cached payloads compress at the
+highest level once per data version, one-off responses at a cheaper level.
+"""
+
+import gzip
+from typing import Optional
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/msgpack')
+
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """Best encoding the client accepts (werkzeug `request.accept_encodings`), or None."""
+    candidates = (['br'] if BROTLI_AVAILABLE else []) + ['gzip']
+    return accept_encodings.best_match(candidates) if accept_encodings else None
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if cached else 5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=9 if cached else 6)
+    return body
+
+
+def compress_response(response, accept_encodings):
+    """after_request hook body: compress a large uncompressed response in place."""
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    body = response.get_data()
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,86 @@
+"""
+Hot reload of the season data file.
+
+DataFileWatcher polls the inode, mtime and size of the data file (and of its
+columnar twin, see columnar_data.py) on a daemon thread.
+Once a changed file has looked the same for two polls in a row (so a
+half-written file is never read), it calls `on_change`, which loads and
+indexes the file and publishes the new snapshot with a single reference
+swap.  Requests already running keep the snapshot they started with.
+"""
+
+import os
+import threading
+from typing import Callable, Optional, Sequence, Tuple
+
+DEFAULT_INTERVAL = 60
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime in ns, size) of `path`, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def files_stamp(paths: Sequence[str]) -> Optional[Tuple]:
+    """file_stamp() of every path, or None if none of them exist."""
+    stamps = tuple(file_stamp(path) for path in paths)
+    return None if all(stamp is None for stamp in stamps) else stamps
+
+
+class DataFileWatcher:
+    def __init__(self, paths: Sequence[str], on_change: Callable[[], bool], interval: float = DEFAULT_INTERVAL):
+        """`on_change()` loads the data and returns True once it is live."""
+        self.paths = tuple(paths)
+        self.on_change = on_change
+        self.interval = interval
+        self.loaded = None
+        self.failed = None
+        self._seen = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def mark_loaded(self, stamp=None):
+        """Record the file version that is currently being served."""
+        self.loaded = stamp if stamp is not None else files_stamp(self.paths)
+
+    def check(self) -> bool:
+        """One poll; returns True if a new version of the file was loaded."""
+        stamp = files_stamp(self.paths)
+        settled = stamp == self._seen
+        self._seen = stamp
+        if stamp is None or stamp in (self.loaded, self.failed) or not settled:
+            return False
+
+        print(f"Data file changed, reloading {', '.join(self.paths)}")
+        try:
+            ok = self.on_change()
+        except Exception as e:
+            print(f"Error reloading data file: {e}")
+            ok = False
+        # A file that fails to load is skipped until it changes again.
+        if ok:
+            self.loaded = stamp
+        else:
+            self.failed = stamp
+        return bool(ok)
+
+    def start(self) -> 'DataFileWatcher':
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        if self.loaded is None:
+            self.mark_loaded()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='data-file-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,174 @@
+"""
+The loaded season, owned in one place.
+
+DatasetService loads the season file once and publishes an immutable
+Snapshot with a single reference swap.  Every consumer reads the same
+snapshot through shared, read-only views:
+
+    records   the list of player dicts (legacy code)
+    store     the columnar PlayerStore and everything indexed from it
+    frame()   a pandas DataFrame of the records, built once per snapshot
+
+The API routes, live game previews, the AI system and recommendations all
+go through the module-level `dataset`, so memory holds one copy of the
+season and everything agrees on one data version.
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from columnar_data import columnar_path, load_player_data
+from data_snapshots import DEFAULT_INTERVAL, DataFileWatcher, files_stamp
+from leaders import STATS
+from player_store import PlayerStore, build_player_store
+from teams import TEAM_IDS
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nba_2025_26_data.pkl')
+
+
+class Snapshot:
+    """One loaded season; never modified after it is published."""
+
+    def __init__(self, records: List[Dict], store: Optional[PlayerStore], columnar=None):
+        self.records = records
+        self.store = store
+        self.columnar = columnar
+        self.version = store.version if store else None
+        self._frame = None
+        self._frame_lock = threading.Lock()
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame of the records, shared by every caller: copy before modifying it.
+
+        A columnar season is read column by column, so no record dicts are built.
+        """
+        if self._frame is None:
+            with self._frame_lock:
+                if self._frame is None:
+                    if self.columnar is not None:
+                        self._frame = pd.DataFrame({name: self.columnar.field(name, np.nan)
+                                                    for name in self.columnar.names})
+                    else:
+                        self._frame = pd.DataFrame(list(self.records))
+        return self._frame
+
+
+class DatasetService:
+    def __init__(self, path: str = DATA_FILE, known_teams=TEAM_IDS):
+        self.path = path
+        self.known_teams = known_teams
+        self.snapshot: Optional[Snapshot] = None
+        self.loaded_stamp = None
+        self.watcher: Optional[DataFileWatcher] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def records(self) -> Optional[List[Dict]]:
+        snapshot = self.snapshot
+        return snapshot.records if snapshot else None
+
+    @property
+    def store(self) -> Optional[PlayerStore]:
+        snapshot = self.snapshot
+        return snapshot.store if snapshot else None
+
+    @property
+    def version(self):
+        """Version of the loaded season, or None before anything is loaded."""
+        snapshot = self.snapshot
+        return snapshot.version if snapshot else None
+
+    def frame(self) -> Optional[pd.DataFrame]:
+        snapshot = self.snapshot
+        return snapshot.frame() if snapshot else None
+
+    def files(self) -> tuple:
+        """The season pickle and its memory-mapped columnar twin."""
+        return self.path, columnar_path(self.path)
+
+    def publish(self, records: List[Dict], columnar=None) -> Snapshot:
+        """Index `records` and make them the live season.
+
+        The snapshot is fully built before the single assignment that
+        publishes it, and readers take `snapshot` once, so a reload never
+        mixes versions inside a request.
+        """
+        snapshot = Snapshot(records, build_player_store(records, self.known_teams, columnar), columnar)
+        self.snapshot = snapshot
+        return snapshot
+
+    def load(self) -> bool:
+        """Load the season, from the columnar file when it is current, else the pickle."""
+        with self._load_lock:
+            try:
+                stamp = files_stamp(self.files())
+                records, columnar = load_player_data(self.path)
+                if records is None:
+                    raise FileNotFoundError
+                self.publish(records, columnar)
+                self.loaded_stamp = stamp
+                source = 'columnar file' if columnar is not None else 'pickle file'
+                print(f"Loaded {len(records)} NBA players from {source}")
+                return True
+            except FileNotFoundError:
+                print(f"NBA data file '{os.path.basename(self.path)}' not found.")
+                return False
+            except Exception as e:
+                print(f"Error loading NBA data: {e}")
+                return False
+
+    def ensure_loaded(self) -> bool:
+        """Load the season unless some caller already has."""
+        return self.snapshot is not None or self.load()
+
+    def warm(self):
+        """Build the lazily computed views of the live snapshot now.
+
+        Called before forking workers, so they share these pages instead of
+        each building its own copy on first use.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return
+        snapshot.frame()
+        if snapshot.store:
+            snapshot.store.similarity.graph()
+            for stat in STATS:
+                snapshot.store.leaders.values(stat)
+
+    def after_fork(self):
+        """Reset process-local state in a freshly forked worker.
+
+        Threads do not survive fork(), so the inherited watcher is dead, and
+        the load lock may have been copied while the parent held it.
+        """
+        self._load_lock = threading.Lock()
+        self.watcher = None
+
+    def start_watcher(self, on_reload: Optional[Callable[[], None]] = None) -> Optional[DataFileWatcher]:
+        """Reload the season file in the background whenever it changes on disk.
+
+        Polls every DATA_RELOAD_INTERVAL seconds (0 disables it); `on_reload()`
+        runs after each successful reload.
+        """
+        interval = float(os.environ.get('DATA_RELOAD_INTERVAL', DEFAULT_INTERVAL))
+        if interval <= 0 or self.watcher is not None:
+            return self.watcher
+
+        def reload() -> bool:
+            if not self.load():
+                return False
+            if on_reload:
+                on_reload()
+            return True
+
+        self.watcher = DataFileWatcher(self.files(), reload, interval)
+        self.watcher.mark_loaded(self.loaded_stamp)
+        return self.watcher.start()
+
+
+dataset = DatasetService()
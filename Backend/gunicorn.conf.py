@@ -0,0 +1,60 @@
+"""
+Gunicorn settings: preload once, fork one worker per core.
+
+The master imports wsgi.py (preload_app), which loads the season data, its
+indexes and the AI model.  Objects are then frozen out of the cyclic GC
+and the workers are forked, so they share those pages copy-on-write
+instead of each loading its own copy.
+
+The master also watches the season file.  When it changes, the master
+loads and indexes the new version and sends itself SIGHUP: gunicorn forks
+fresh workers from the updated memory and lets the old ones finish their
+in-flight requests (graceful_timeout) before they exit.  SIGTERM drains
+the same way on shutdown.
+
+Overrides: PORT, WEB_CONCURRENCY (workers), GUNICORN_THREADS, GUNICORN_TIMEOUT.
+"""
+
+import gc
+import multiprocessing
+import os
+import signal
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+# Threads keep a worker busy while live-game requests wait on the NBA feeds.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # Imported here: this file is re-read on every HUP, the app is not.
+    from dataset import dataset
+
+    def reload_workers():
+        dataset.warm()
+        # The replaced snapshot was frozen before the last fork, and its store
+        # holds reference cycles (leaders/similarity/teams point back at it):
+        # unfreeze so the collector can free it before new workers inherit it.
+        gc.unfreeze()
+        gc.collect()
+        server.log.info("Season data reloaded, replacing workers")
+        os.kill(server.pid, signal.SIGHUP)
+
+    dataset.start_watcher(on_reload=reload_workers)
+
+
+def pre_fork(server, worker):
+    # Keep the GC from touching (and so copying) the preloaded objects in every worker.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from dataset import dataset
+    dataset.after_fork()
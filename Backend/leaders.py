@@ -0,0 +1,146 @@
+"""
+Top-K leaderboards over the columnar PlayerStore.
+
+Every stat, stored or derived, is a float array computed once per store;
+a leaderboard partitions it with argpartition instead of sorting the whole
+league, so per-team and per-position boards cost about the same as the
+league-wide one.  Ties keep load order, matching the store's sort orders.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from teams import TEAM_ALIASES
+
+DEFAULT_LEADERS = 10
+MAX_LEADERS = 50
+
+# stat key -> (display name, columns summed to produce it)
+STAT_COLUMNS = {
+    'ppg': ('Points Per Game', ('PPG_LAST',)),
+    'apg': ('Assists Per Game', ('APG_LAST',)),
+    'rpg': ('Rebounds Per Game', ('RPG_LAST',)),
+    'spg': ('Steals Per Game', ('SPG_LAST',)),
+    'bpg': ('Blocks Per Game', ('BPG_LAST',)),
+    'tov': ('Turnovers Per Game', ('TOV_LAST',)),
+    'mpg': ('Minutes Per Game', ('MIN_LAST',)),
+    'fg_pct': ('Field Goal %', ('FG_PCT_LAST',)),
+    'fg3_pct': ('Three Point %', ('FG3_PCT_LAST',)),
+    'ft_pct': ('Free Throw %', ('FT_PCT_LAST',)),
+    'games': ('Games Played', ('GAMES_PLAYED_LAST',)),
+    'pra': ('Points + Rebounds + Assists', ('PPG_LAST', 'RPG_LAST', 'APG_LAST')),
+    'pr': ('Points + Rebounds', ('PPG_LAST', 'RPG_LAST')),
+    'pa': ('Points + Assists', ('PPG_LAST', 'APG_LAST')),
+    'ra': ('Rebounds + Assists', ('RPG_LAST', 'APG_LAST')),
+    'stocks': ('Steals + Blocks', ('SPG_LAST', 'BPG_LAST')),
+}
+
+# Ratios that need their own formula rather than a column sum.
+RATIO_STATS = {
+    'ast_to': ('Assist to Turnover Ratio', 'APG_LAST', 'TOV_LAST'),
+}
+
+STATS = tuple(STAT_COLUMNS) + tuple(RATIO_STATS)
+
+
+def stat_name(stat: str) -> str:
+    if stat in RATIO_STATS:
+        return RATIO_STATS[stat][0]
+    return STAT_COLUMNS[stat][0]
+
+
+def top_k(values: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rows holding the k largest values, best first; ties keep row order.
+
+    argpartition finds the k-th largest value in linear time; everything at
+    or above it (including every tie at the boundary) is then sorted, which
+    keeps the result identical to a stable descending sort of all rows.
+    """
+    if rows is None:
+        rows = np.arange(len(values), dtype=np.int32)
+    if k <= 0 or not len(rows):
+        return rows[:0]
+    subset = values[rows]
+    if k < len(rows):
+        threshold = subset[np.argpartition(subset, len(rows) - k)[len(rows) - k]]
+        keep = subset >= threshold
+        rows, subset = rows[keep], subset[keep]
+    order = np.lexsort((rows, -subset))
+    return rows[order[:k]]
+
+
+class LeadersEngine:
+    """Leaderboards for one PlayerStore; derived columns are built on first use."""
+
+    def __init__(self, store):
+        self.store = store
+        self._values: Dict[str, np.ndarray] = {}
+        self._league: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def values(self, stat: str) -> np.ndarray:
+        """Stat as a float array, NaN ranked last."""
+        values = self._values.get(stat)
+        if values is None:
+            if stat in RATIO_STATS:
+                _, numerator, denominator = RATIO_STATS[stat]
+                num, den = self.store.column(numerator), self.store.column(denominator)
+                values = np.divide(num, den, out=np.zeros(self.store.size), where=den > 0)
+            else:
+                values = np.sum([self.store.column(c) for c in STAT_COLUMNS[stat][1]], axis=0)
+            values = np.where(np.isnan(values), -np.inf, values)
+            self._values[stat] = values
+        return values
+
+    def top(self, stat: str, n: int = DEFAULT_LEADERS, team: str = '', position: str = '',
+            min_games: int = 0) -> np.ndarray:
+        """Row positions of the `n` leaders in `stat`, optionally within a team/position."""
+        if not team and not position and not min_games:
+            key = (stat, n)
+            rows = self._league.get(key)
+            if rows is None:
+                # No lock: top_k is cheap, and a thread that races us stores the same rows.
+                rows = self._league[key] = top_k(self.values(stat), n)
+            return rows
+
+        # Accept either spelling of a tricode (BKN or BRK), like the team endpoints.
+        mask = self.store.filter_mask('', TEAM_ALIASES.get(team, team), position)
+        if min_games:
+            mask = mask & (self.store.column('GAMES_PLAYED_LAST') >= min_games)
+        return top_k(self.values(stat), n, np.flatnonzero(mask).astype(np.int32))
+
+    def leaderboard(self, stat: str, n: int = DEFAULT_LEADERS, team: str = '', position: str = '',
+                    min_games: int = 0) -> List[Dict]:
+        values = self.values(stat)
+        store = self.store
+        return [{
+            'rank': rank,
+            'id': int(store.ids[row]),
+            'name': store.names[row],
+            'team': store.team_labels[store.team_codes[row]],
+            'position': store.position_labels[store.position_codes[row]],
+            'value': round(float(values[row]), 3 if stat in RATIO_STATS or stat.endswith('_pct') else 1),
+        } for rank, row in enumerate(self.top(stat, n, team, position, min_games).tolist(), 1)]
+
+    def top_pra_player(self) -> Optional[Dict]:
+        """Highest PPG+RPG+APG player (proxy for last week's leader), as /api/stats/top-pra returns it."""
+        rows = self.top('pra', 1)
+        if not len(rows):
+            return None
+        row = int(rows[0])
+        best = self.store.records[row]
+        ppg = round(best.get('PPG_LAST', 0), 1)
+        rpg = round(best.get('RPG_LAST', 0), 1)
+        apg = round(best.get('APG_LAST', 0), 1)
+        return {
+            'name':     best.get('PLAYER_NAME', ''),
+            'team':     best.get('TEAM', ''),
+            'position': best.get('POSITION', ''),
+            'ppg':      ppg,
+            'rpg':      rpg,
+            'apg':      apg,
+            'pra':      round(ppg + rpg + apg, 1),
+            'spg':      round(best.get('SPG_LAST', 0), 1),
+            'bpg':      round(best.get('BPG_LAST', 0), 1),
+            'player_id': int(self.store.ids[row]),
+        }
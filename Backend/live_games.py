@@ -2,39 +2,69 @@ import requests
 from datetime import datetime, timezone, timedelta
 import time
 
+from dataset import dataset
+from teams import TEAM_IDS
+
 SCOREBOARD_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
 BOXSCORE_URL   = "https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{gameId}.json"
 SCHEDULE_URL   = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
 
-TEAM_IDS = {
-    "ATL":1610612737,"BOS":1610612738,"BKN":1610612751,"CHA":1610612766,
-    "CHI":1610612741,"CLE":1610612739,"DAL":1610612742,"DEN":1610612743,
-    "DET":1610612765,"GSW":1610612744,"HOU":1610612745,"IND":1610612754,
-    "LAC":1610612746,"LAL":1610612747,"MEM":1610612763,"MIA":1610612748,
-    "MIL":1610612749,"MIN":1610612750,"NOP":1610612740,"NYK":1610612752,
-    "OKC":1610612760,"ORL":1610612753,"PHI":1610612755,"PHX":1610612756,
-    "POR":1610612757,"SAC":1610612758,"SAS":1610612759,"TOR":1610612761,
-    "UTA":1610612762,"WAS":1610612764,
-}
-
 TEAM_LOGOS = {t: f"https://cdn.nba.com/logos/nba/{id}/global/L/logo.svg" for t, id in TEAM_IDS.items()}
 
 _cache = {}
+_failed = {}
 CACHE_TTL = 30
+# A feed that just failed is not retried for this long, so an outage doesn't
+# turn every request into another timed-out upstream call.
+FAILURE_TTL = 5
+
+# gameStatus values with a box score to show (2 = live, 3 = final)
+LIVE_STATUSES = (2, 3)
+
+def cached(url):
+    """(hit, data) from the shared feed cache: a fresh response, or None for a recent failure."""
+    now = time.time()
+    entry = _cache.get(url)
+    if entry and now - entry['ts'] < CACHE_TTL:
+        return True, entry['data']
+    if now - _failed.get(url, 0) < FAILURE_TTL:
+        return True, None
+    return False, None
+
+def remember(url, data, ts):
+    """Record a fetch result (None for a failed fetch) in the cache shared by sync and async callers."""
+    if data is None:
+        _failed[url] = ts
+    else:
+        _cache[url] = {'data': data, 'ts': ts}
+        _failed.pop(url, None)
 
 def _get(url):
+    hit, data = cached(url)
+    if hit:
+        return data
     now = time.time()
-    if url in _cache and now - _cache[url]['ts'] < CACHE_TTL:
-        return _cache[url]['data']
     try:
         r = requests.get(url, timeout=3, headers={"User-Agent": "Mozilla/5.0"})
         r.raise_for_status()
         data = r.json()
-        _cache[url] = {'data': data, 'ts': now}
-        return data
     except Exception as e:
         print(f"[live_games] fetch error: {e}")
-        return None
+        data = None
+    remember(url, data, now)
+    return data
+
+def cache_stamp(url):
+    """Fetch time of a still-fresh cached upstream response, or None if it must be refetched."""
+    entry = _cache.get(url)
+    if entry and time.time() - entry['ts'] < CACHE_TTL:
+        return entry['ts']
+    return None
+
+def live_game_ids(scoreboard):
+    """Ids of today's games that have a box score (live or final)."""
+    return [g.get('gameId', '') for g in scoreboard.get('scoreboard', {}).get('games', [])
+            if g.get('gameStatus', 1) in LIVE_STATUSES]
 
 def _fmt_player_live(p):
     s = p.get('statistics', {})
@@ -61,35 +91,15 @@ def _fmt_player_live(p):
         'plusMinus': s.get('plusMinusPoints', 0),
     }
 
-def _roster_from_pkl(tricode, nba_data):
-    """Build a zeroed-out game roster from pkl season data for a given team."""
-    if not nba_data:
-        return []
-    players = [p for p in nba_data if p.get('TEAM') == tricode]
-    result = []
-    for p in players:
-        name = p.get('PLAYER_NAME', '')
-        result.append({
-            'personId':  p.get('PLAYER_ID', abs(hash(name)) % 10**7),
-            'name':      name,
-            'jerseyNum': '',
-            'position':  p.get('POSITION', ''),
-            'status':    'ACTIVE',
-            'oncourt':   False,
-            # Game stats all zero (game hasn't started)
-            'pts': 0, 'reb': 0, 'ast': 0, 'stl': 0, 'blk': 0,
-            'fgm': 0, 'fga': 0, 'fg3m': 0, 'fg3a': 0,
-            'ftm': 0, 'fta': 0, 'tov': 0, 'min': '0m', 'plusMinus': 0,
-            # Season stats for context
-            'season_ppg': round(p.get('PPG_LAST', 0), 1),
-            'season_rpg': round(p.get('RPG_LAST', 0), 1),
-            'season_apg': round(p.get('APG_LAST', 0), 1),
-        })
-    # Sort by season PPG descending so starters appear first
-    result.sort(key=lambda x: x['season_ppg'], reverse=True)
-    return result
+def _season_teams():
+    store = dataset.store
+    return store.teams if store else None
+
+def _season_roster(tricode, teams):
+    """Zeroed-out game roster from the season data, precomputed per data version."""
+    return teams.game_roster(tricode) if teams else []
 
-def get_todays_games(nba_data=None):
+def get_todays_games(teams=None):
     data = _get(SCOREBOARD_URL)
 
     print("DATA KEYS:", data.keys() if data else "NO DATA")
@@ -97,8 +107,11 @@ def get_todays_games(nba_data=None):
     if not data:
         return []
 
-        
+    boxscores = {game_id: _get(BOXSCORE_URL.format(gameId=game_id)) for game_id in live_game_ids(data)}
+    return build_todays_games(data, boxscores, teams or _season_teams())
 
+def build_todays_games(data, boxscores, teams):
+    """Today's games from a scoreboard feed and the box scores of its live/final games."""
     games = data.get('scoreboard', {}).get('games', [])
     result = []
 
@@ -144,9 +157,9 @@ def get_todays_games(nba_data=None):
             'players':   {'home': [], 'away': []},
         }
 
-        if status_num in (2, 3):
+        if status_num in LIVE_STATUSES:
             # Live/final — use real boxscore
-            box = _get(BOXSCORE_URL.format(gameId=game_id))
+            box = boxscores.get(game_id)
             if box:
                 bsg = box.get('game', {})
                 for side in ('homeTeam', 'awayTeam'):
@@ -156,19 +169,22 @@ def get_todays_games(nba_data=None):
                     ]
         else:
             # Future today — populate rosters from pkl with zeroed game stats
-            game_obj['players']['home'] = _roster_from_pkl(home_tri, nba_data)
-            game_obj['players']['away'] = _roster_from_pkl(away_tri, nba_data)
+            game_obj['players']['home'] = _season_roster(home_tri, teams)
+            game_obj['players']['away'] = _season_roster(away_tri, teams)
 
         result.append(game_obj)
 
     return result
 
-def get_upcoming_games(days=7, nba_data=None):
+def get_upcoming_games(days=7, teams=None):
     """Return next N days of games with zeroed game stats but season stats from pkl."""
     data = _get(SCHEDULE_URL)
     if not data:
         return []
+    return build_upcoming_games(data, days, teams or _season_teams())
 
+def build_upcoming_games(data, days, teams):
+    """Next `days` days of games from a schedule feed."""
     today    = datetime.now(timezone.utc).date()
     upcoming = []
 
@@ -216,33 +232,9 @@ def get_upcoming_games(days=7, nba_data=None):
                 'period':    0,
                 'gameClock': '',
                 'players': {
-                    'home': _roster_from_pkl(home_tri, nba_data),
-                    'away': _roster_from_pkl(away_tri, nba_data),
+                    'home': _season_roster(home_tri, teams),
+                    'away': _season_roster(away_tri, teams),
                 },
             })
 
     return upcoming[:20]
-
-def get_top_pra_player(nba_data, days=7):
-    """Return the player with highest PPG+RPG+APG from pkl data (proxy for last week leader)."""
-    if not nba_data:
-        return None
-    best = max(
-        nba_data,
-        key=lambda p: (p.get('PPG_LAST', 0) or 0) + (p.get('RPG_LAST', 0) or 0) + (p.get('APG_LAST', 0) or 0)
-    )
-    ppg = round(best.get('PPG_LAST', 0), 1)
-    rpg = round(best.get('RPG_LAST', 0), 1)
-    apg = round(best.get('APG_LAST', 0), 1)
-    return {
-        'name':     best.get('PLAYER_NAME', ''),
-        'team':     best.get('TEAM', ''),
-        'position': best.get('POSITION', ''),
-        'ppg':      ppg,
-        'rpg':      rpg,
-        'apg':      apg,
-        'pra':      round(ppg + rpg + apg, 1),
-        'spg':      round(best.get('SPG_LAST', 0), 1),
-        'bpg':      round(best.get('BPG_LAST', 0), 1),
-        'player_id': best.get('PLAYER_ID'),
-    }
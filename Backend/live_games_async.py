@@ -0,0 +1,87 @@
+"""
+Asyncio variant of live_games for the ASGI server (asgi.py).
+
+Upstream feeds are fetched on the event loop, so a request waiting on the
+NBA CDN holds no thread.  Concurrent requests for the same feed share one
+in-flight fetch, and a scoreboard's box scores are fetched concurrently
+rather than one after another.  Results go into the same cache as the
+sync module; asgi.py only warms that cache, and the Flask routes then
+build the games from it, so both serving modes return identical data.
+
+httpx is optional: without it each fetch runs the sync `requests` call in
+a worker thread (still one per feed, however many requests wait on it).
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from live_games import BOXSCORE_URL, SCOREBOARD_URL, _get, cached, live_game_ids, remember
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+TIMEOUT = 3
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+_client = None
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _get_client():
+    """One pooled client per process, created inside the running event loop."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=TIMEOUT, headers=HEADERS,
+                                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+    return _client
+
+
+async def close():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _fetch(url: str) -> Optional[Dict]:
+    if not HTTPX_AVAILABLE:
+        # _get records the result in the shared cache itself.
+        return await asyncio.to_thread(_get, url)
+    now = time.time()
+    try:
+        r = await _get_client().get(url)
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        print(f"[live_games] fetch error: {e}")
+        data = None
+    remember(url, data, now)
+    return data
+
+
+async def fetch(url: str) -> Optional[Dict]:
+    """Feed JSON from the shared cache, or from one upstream fetch shared by all waiters."""
+    hit, data = cached(url)
+    if hit:
+        return data
+    task = _inflight.get(url)
+    if task is None:
+        task = _inflight[url] = asyncio.ensure_future(_fetch(url))
+        task.add_done_callback(lambda _: _inflight.pop(url, None))
+    # shield: a client disconnecting must not cancel the fetch other requests wait on.
+    return await asyncio.shield(task)
+
+
+async def fetch_scoreboard() -> Tuple[Optional[Dict], Dict[str, Optional[Dict]]]:
+    """Today's scoreboard and the box scores of its live/final games, fetched concurrently."""
+    data = await fetch(SCOREBOARD_URL)
+    if not data:
+        return None, {}
+    game_ids = live_game_ids(data)
+    boxes = await asyncio.gather(*(fetch(BOXSCORE_URL.format(gameId=game_id)) for game_id in game_ids))
+    return data, dict(zip(game_ids, boxes))
+
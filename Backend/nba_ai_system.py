@@ -3,6 +3,7 @@ import numpy as np
 import pickle
 import os
 import json
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 import torch
@@ -12,7 +13,9 @@ from torch.utils.data import Dataset, DataLoader
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 
+from dataset import dataset
 from nba_web_scraper import NBAWebScraper
+from player_similarity import FEATURE_COLUMNS
 
 STAT_SCALE = 1.1
 
@@ -57,8 +60,14 @@ class NBAAISystem:
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.feature_columns = []
         self.target_columns = ['PPG_NEXT', 'APG_NEXT', 'RPG_NEXT']
-        self.data = None
+        self._prepared = None
+        self._prepared_lock = threading.Lock()
         self.model_trained = False
+
+    @property
+    def data(self):
+        """Season records, shared with the API through the dataset service."""
+        return dataset.records
         
     def initialize_system(self, force_refresh=False):
         print("Initializing NBA AI System...")
@@ -68,8 +77,7 @@ class NBAAISystem:
         
         if os.path.exists(data_file) and os.path.exists(model_file) and not force_refresh:
             print("Found existing data and model")
-            self.data = self.scraper.load_data()
-            if self.data and self.load_model():
+            if dataset.ensure_loaded() and self.load_model():
                 self.model_trained = True
                 return True
             else:
@@ -79,13 +87,14 @@ class NBAAISystem:
             print("No existing data or model found, proceeding to train.")
         
         print("🔄 Scraping NBA data for 2025-26 season...")
-        self.data = self.scraper.scrape_player_stats('2025-26')
+        scraped = self.scraper.scrape_player_stats('2025-26')
         
-        if not self.data:
+        if not scraped:
             print("❌ Failed to scrape NBA data")
             return False
         
-        self.scraper.save_data(self.data)
+        self.scraper.save_data(scraped)
+        dataset.publish(scraped)
         
         print("🧠 Training PyTorch neural network...")
         if self.train_model():
@@ -97,27 +106,25 @@ class NBAAISystem:
             print("Failed to train model")
         return False
 
-    def prepare_data(self):
-        if not self.data:
+    def prepare_data(self, snapshot=None):
+        """(X, y, df) for `snapshot` (default: the live season), computed once per data version.
+
+        Callers share the cached result, so treat it as read-only.
+        """
+        snapshot = snapshot or dataset.snapshot
+        if snapshot is None or not snapshot.records:
             print("No data available!")
             return None, None, None
         
-        df = pd.DataFrame(self.data)
-        df = df.fillna(0)
-        
-        self.feature_columns = [
-            'HEIGHT', 'WEIGHT', 'AGE',
-            'PPG_LAST', 'APG_LAST', 'RPG_LAST', 'SPG_LAST', 'BPG_LAST',
-            'TOV_LAST', 'FG_PCT_LAST', 'FG3_PCT_LAST', 'FT_PCT_LAST', 'MIN_LAST',
-            'GAMES_PLAYED_LAST', 'PPG_PREV', 'APG_PREV', 'RPG_PREV',
-            'SPG_PREV', 'BPG_PREV', 'TOV_PREV', 'FG_PCT_PREV', 'FG3_PCT_PREV',
-            'FT_PCT_PREV', 'MIN_PREV', 'GAMES_PLAYED_PREV',
-            'PPG_LAST_10', 'APG_LAST_10', 'RPG_LAST_10', 'FG_PCT_LAST_10',
-            'PPG_TREND', 'APG_TREND', 'RPG_TREND',
-            'PPG_STD', 'APG_STD', 'RPG_STD', 'CONSISTENCY_SCORE'
-        ]
+        with self._prepared_lock:
+            if self._prepared is None or self._prepared[0] != snapshot.version:
+                self._prepared = (snapshot.version, self._prepare_frame(snapshot.frame()))
+            return self._prepared[1]
+
+    def _prepare_frame(self, frame):
+        df = frame.fillna(0)
         
-        self.feature_columns = [col for col in self.feature_columns if col in df.columns]
+        self.feature_columns = [col for col in FEATURE_COLUMNS if col in df.columns]
         
         if 'AGE' in df.columns:
             df['AGE'] = df['AGE'].fillna(df['AGE'].median())
@@ -298,21 +305,35 @@ class NBAAISystem:
         overperformers = overperformers.sort_values('TOTAL_STAT_INCREASE', ascending=False)
         return overperformers.head(top_n)
 
+    def get_name_index(self, snapshot=None):
+        """Typo-tolerant name index over the season, shared with the API's store."""
+        snapshot = snapshot or dataset.snapshot
+        store = snapshot.store if snapshot else None
+        return store.fuzzy_index if store else None
+
     def get_player_prediction(self, player_name):
         if not self.model_trained:
             self.initialize_system()
             return None
         
-        df = pd.DataFrame(self.data)
+        # One snapshot for the lookup and the features, even if a reload lands meanwhile.
+        snapshot = dataset.snapshot
+        df = snapshot.frame()
         player_data = df[df['PLAYER_NAME'].str.contains(player_name, case=False, na=False)]
         
+        name_index = self.get_name_index(snapshot)
+        if player_data.empty and name_index is not None:
+            row = name_index.best_row(player_name)
+            if row is not None:
+                player_data = df.iloc[[row]]
+        
         if player_data.empty:
             print(f"Player '{player_name}' not found.")
             return None
         
         player = player_data.iloc[0]
         
-        X, _, _ = self.prepare_data()
+        X, _, _ = self.prepare_data(snapshot)
         player_idx = player_data.index[0]
         player_features = X[player_idx:player_idx+1]
         
@@ -15,6 +15,7 @@ from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
 import re
 from playwright.sync_api import sync_playwright
+from columnar_data import columnar_path, load_player_data, write_columnar
 
 class NBAWebScraper:
     """Web scraper for NBA player statistics"""
@@ -481,19 +482,21 @@ class NBAWebScraper:
     def save_data(self, data, filename='nba_2025_26_data.pkl'):
         """Save scraped data to file"""
         filepath = os.path.join(os.path.dirname(__file__), filename)
-        with open(filepath, 'wb') as f:
+        # Write then rename, so a running server never reads a half-written file.
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'wb') as f:
             pickle.dump(data, f)
+        os.replace(tmp_path, filepath)
+        write_columnar(data, columnar_path(filepath))
         print(f"Data saved to {filepath}")
     
     def load_data(self, filename='nba_2025_26_data.pkl'):
         """Load data from file"""
         filepath = os.path.join(os.path.dirname(__file__), filename)
-        if os.path.exists(filepath):
-            with open(filepath, 'rb') as f:
-                data = pickle.load(f)
-            print(f"Data loaded from {filepath}")
-            return data
-        return None
+        data, columnar = load_player_data(filepath)
+        if data is not None:
+            print(f"Data loaded from {columnar.path if columnar is not None else filepath}")
+        return data
 
 def test_scraper():
     """Test the NBA web scraper"""
@@ -0,0 +1,56 @@
+"""
+Hash indexes from PLAYER_ID and player name to a row in the PlayerStore.
+
+The index is built together with the store it points into, so swapping the
+store swaps the index with it and lookups never see a half-built map.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+_NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+_SPACES = re.compile(r'\s+')
+
+# Letters NFKD leaves alone because they are not base letter + combining mark.
+_EXTRA_FOLDS = str.maketrans({'ø': 'o', 'ł': 'l', 'đ': 'd', 'ı': 'i', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe'})
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase and strip diacritics, so 'Dončić' folds to 'doncic'."""
+    decomposed = unicodedata.normalize('NFKD', (text or '').lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).translate(_EXTRA_FOLDS)
+
+
+def normalize_name(name: str) -> str:
+    """Accent-folded, punctuation-free, single-spaced form of a player name."""
+    folded = _NON_ALNUM.sub('', fold_accents(name).replace('-', ' '))
+    return _SPACES.sub(' ', folded).strip()
+
+
+class PlayerIndex:
+    """O(1) lookups from PLAYER_ID, exact name and normalized name to row position."""
+
+    def __init__(self, ids: Iterable[int], names: Iterable[str]):
+        self.by_id: Dict[int, int] = {}
+        self.by_name: Dict[str, int] = {}
+        self.by_normalized: Dict[str, int] = {}
+        for row, (player_id, name) in enumerate(zip(ids, names)):
+            # First occurrence wins, matching the next(...) scans this replaces.
+            self.by_id.setdefault(int(player_id), row)
+            self.by_name.setdefault(name, row)
+            self.by_normalized.setdefault(normalize_name(name), row)
+
+    def row_for_id(self, player_id: int) -> Optional[int]:
+        return self.by_id.get(player_id)
+
+    def row_for_name(self, name: str) -> Optional[int]:
+        """Exact PLAYER_NAME match first, then the normalized form."""
+        row = self.by_name.get(name)
+        if row is None:
+            row = self.by_normalized.get(normalize_name(name))
+        return row
+
+    def rows_for_ids(self, player_ids: Iterable[Optional[int]]) -> List[Optional[int]]:
+        """Row per id, None where the id is unknown (or itself None)."""
+        return [self.by_id.get(player_id) for player_id in player_ids]
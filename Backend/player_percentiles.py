@@ -0,0 +1,57 @@
+"""
+League-wide and within-position percentile ranks and z-scores.
+
+Computed once per PlayerStore for every numeric sort stat, over whole
+columns: groups are the position codes, so each statistic is a handful of
+bincount/searchsorted calls rather than a loop over players.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+# column suffix -> summary key
+PERCENTILE_KINDS = (
+    ('LEAGUE_PCTL', 'league'),
+    ('POSITION_PCTL', 'position'),
+    ('LEAGUE_Z', 'league_z'),
+    ('POSITION_Z', 'position_z'),
+)
+
+
+def percentile_ranks(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Percent of each row's group below it, counting ties as half (0-100)."""
+    _, ranks = np.unique(values, return_inverse=True)
+    width = len(values) + 1
+    combined = groups.astype(np.int64) * width + ranks
+    ordered = np.sort(combined)
+
+    start = np.searchsorted(ordered, groups.astype(np.int64) * width, side='left')
+    below = np.searchsorted(ordered, combined, side='left') - start
+    upto = np.searchsorted(ordered, combined, side='right') - start
+    counts = np.bincount(groups)[groups]
+    return (below + upto) / 2.0 / counts * 100.0
+
+
+def z_scores(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Standard score of each row within its group; 0 where the group has no spread."""
+    counts = np.bincount(groups)
+    means = np.bincount(groups, weights=values) / counts
+    deviations = values - means[groups]
+    stds = np.sqrt(np.bincount(groups, weights=deviations * deviations) / counts)[groups]
+    return np.divide(deviations, stds, out=np.zeros(len(values)), where=stds > 0)
+
+
+def compute_percentiles(store, stats: Iterable[Tuple[str, str]]) -> Dict[str, np.ndarray]:
+    """Columns `<RAW_KEY>_<KIND>` for every (stat key, raw column) pair in `stats`."""
+    league = np.zeros(store.size, dtype=np.int64)
+    positions = store.position_codes.astype(np.int64)
+
+    columns = {}
+    for _, raw_key in stats:
+        values = store.column(raw_key)
+        columns[f'{raw_key}_LEAGUE_PCTL'] = percentile_ranks(values, league)
+        columns[f'{raw_key}_POSITION_PCTL'] = percentile_ranks(values, positions)
+        columns[f'{raw_key}_LEAGUE_Z'] = z_scores(values, league)
+        columns[f'{raw_key}_POSITION_Z'] = z_scores(values, positions)
+    return columns
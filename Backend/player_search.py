@@ -0,0 +1,243 @@
+"""
+Search indexes over player names.
+
+NgramIndex answers case- and accent-insensitive substring queries by
+intersecting n-gram posting lists instead of scanning every name.
+FuzzyIndex is a SymSpell-style delete index for typo-tolerant lookups.
+PrefixIndex backs autocomplete over player, team and position names.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from player_index import fold_accents, normalize_name
+
+NGRAM = 3
+
+MAX_EDIT_DISTANCE = 2
+FUZZY_PREFIX_LENGTH = 7
+MIN_TOKEN_LENGTH = 3
+
+AUTOCOMPLETE_LIMIT = 8
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+class NgramIndex:
+    """Inverted index from every 1..3-gram of the folded names to sorted row arrays."""
+
+    def __init__(self, names: Iterable[str]):
+        self.folded: List[str] = [fold_accents(name) for name in names]
+        self.size = len(self.folded)
+
+        postings: Dict[str, List[int]] = {}
+        for row, name in enumerate(self.folded):
+            grams = set()
+            for n in range(1, NGRAM + 1):
+                grams.update(name[i:i + n] for i in range(len(name) - n + 1))
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+
+        # Rows are appended in order, so every posting array is already sorted.
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def search(self, query: str) -> np.ndarray:
+        """Sorted row positions whose folded name contains the folded query."""
+        q = fold_accents(query)
+        if not q:
+            return np.arange(self.size, dtype=np.int32)
+        if len(q) <= NGRAM:
+            return self.postings.get(q, _EMPTY)
+
+        grams = {q[i:i + NGRAM] for i in range(len(q) - NGRAM + 1)}
+        lists = sorted((self.postings.get(gram, _EMPTY) for gram in grams), key=len)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+
+        # Sharing every trigram doesn't guarantee they are contiguous; confirm.
+        return np.array([row for row in candidates if q in self.folded[row]], dtype=np.int32)
+
+    def mask(self, query: str) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.search(query)] = True
+        return mask
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """Every string reachable from `term` by removing up to max_distance characters."""
+    found = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once it is exceeded.
+
+    A cell more than max_distance off the diagonal can't be within budget,
+    so each row only fills that band; the rest stays at max_distance + 1.
+    """
+    over = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+    n = len(b)
+    prev_prev = None
+    prev = [j if j <= max_distance else over for j in range(n + 1)]
+    for i in range(1, len(a) + 1):
+        lo, hi = max(1, i - max_distance), min(n, i + max_distance)
+        cur = [over] * (n + 1)
+        if i <= max_distance:
+            cur[0] = i
+        for j in range(lo, hi + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev_prev is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev_prev[j - 2] + 1)
+            cur[j] = value
+        if min(cur[lo - 1:hi + 1]) > max_distance:
+            return over
+        prev_prev, prev = prev, cur
+    return min(prev[-1], over)
+
+
+class FuzzyIndex:
+    """Typo-tolerant name lookup with bounded edit distance.
+
+    Full normalized names and their individual tokens are indexed, so both
+    'lebron jmaes' and 'jokc' resolve.  Only deletes of each term's first
+    FUZZY_PREFIX_LENGTH characters are stored (the SymSpell prefix trick),
+    which keeps the table small; candidates are verified with a real
+    distance computation before being returned.
+    """
+
+    def __init__(self, names: Iterable[str], scores: Optional[Sequence[float]] = None):
+        self.terms: List[str] = []
+        self.term_rows: List[List[int]] = []
+        term_ids: Dict[str, int] = {}
+        names = list(names)
+
+        for row, name in enumerate(names):
+            normalized = normalize_name(name)
+            tokens = [t for t in normalized.split(' ') if len(t) >= MIN_TOKEN_LENGTH]
+            for term in {normalized, *tokens}:
+                if not term:
+                    continue
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.term_rows.append([])
+                self.term_rows[term_id].append(row)
+
+        self.deletes: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(self.terms):
+            for variant in _deletes(term[:FUZZY_PREFIX_LENGTH], MAX_EDIT_DISTANCE):
+                self.deletes.setdefault(variant, []).append(term_id)
+
+        self.scores = np.zeros(len(names)) if scores is None else np.asarray(scores, dtype=np.float64)
+
+    def _matches(self, term: str, max_distance: int, rows: Optional[Set[int]] = None) -> Dict[int, int]:
+        """row -> best distance for one normalized term, only among `rows` if given."""
+        # Short terms get a smaller budget, otherwise 'ja' matches half the league.
+        max_distance = min(max_distance, (len(term) - 1) // 2)
+        if max_distance < 0:
+            return {}
+        candidates = set()
+        for variant in _deletes(term[:FUZZY_PREFIX_LENGTH], max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+
+        best: Dict[int, int] = {}
+        for term_id in candidates:
+            term_rows = self.term_rows[term_id]
+            # Skip the distance computation for terms that can't reach an allowed row.
+            if rows is not None and rows.isdisjoint(term_rows):
+                continue
+            distance = edit_distance(term, self.terms[term_id], max_distance)
+            if distance > max_distance:
+                continue
+            for row in term_rows:
+                if distance < best.get(row, max_distance + 1) and (rows is None or row in rows):
+                    best[row] = distance
+        return best
+
+    def search(self, query: str, max_distance: int = MAX_EDIT_DISTANCE, limit: int = 10) -> List[Tuple[int, int]]:
+        """(row, distance) pairs ranked by distance, then by score descending.
+
+        A multi-word query that doesn't match a whole name is tried word by
+        word instead ('shai alexnder'); a row must match every word, and the
+        sum of its word distances must stay within max_distance too.  Each
+        word is only checked against the rows the earlier words left, with
+        what remains of the budget, so the cost tracks the surviving rows
+        rather than the size of the catalog.
+        """
+        q = normalize_name(query)
+        if not q:
+            return []
+        max_distance = min(max(int(max_distance), 0), MAX_EDIT_DISTANCE)
+
+        best = self._matches(q, max_distance)
+        words = [w for w in q.split(' ') if len(w) >= MIN_TOKEN_LENGTH]
+        if not best and len(words) > 1:
+            totals = self._matches(words[0], max_distance)
+            for word in words[1:]:
+                if not totals:
+                    break
+                budget = max_distance - min(totals.values())
+                matches = self._matches(word, budget, set(totals))
+                totals = {row: totals[row] + distance for row, distance in matches.items()
+                          if totals[row] + distance <= max_distance}
+            best = totals
+
+        ranked = sorted(best.items(), key=lambda item: (item[1], -self.scores[item[0]], item[0]))
+        return ranked[:limit]
+
+    def best_row(self, query: str, max_distance: int = MAX_EDIT_DISTANCE) -> Optional[int]:
+        matches = self.search(query, max_distance, limit=1)
+        return matches[0][0] if matches else None
+
+
+class PrefixIndex:
+    """Sorted-array prefix index with a precomputed popularity score per suggestion.
+
+    Every suggestion is reachable from its full folded label and from each
+    word in it, so 'jam' suggests 'LeBron James'.  The suggestion dicts are
+    built once; a lookup is two bisects plus a sort of the matching scores.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Dict, str, float]]):
+        """`entries` are (suggestion dict, label, score) triples."""
+        self.suggestions: List[Dict] = []
+        keyed = []
+        scores = []
+        for suggestion_id, (suggestion, label, score) in enumerate(entries):
+            self.suggestions.append(suggestion)
+            scores.append(score)
+            folded = normalize_name(label)
+            for key in {folded, *folded.split(' ')}:
+                if key:
+                    keyed.append((key, suggestion_id))
+        keyed.sort()
+
+        self.keys: List[str] = [key for key, _ in keyed]
+        self.key_suggestions = np.array([sid for _, sid in keyed], dtype=np.int32)
+        self.scores = np.asarray(scores, dtype=np.float64)
+
+    def complete(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[Dict]:
+        p = normalize_name(prefix)
+        if not p:
+            return []
+        lo = bisect_left(self.keys, p)
+        hi = bisect_left(self.keys, p + '\uffff', lo)
+        if lo == hi:
+            return []
+
+        matched = np.unique(self.key_suggestions[lo:hi])
+        ranked = matched[np.argsort(-self.scores[matched], kind='stable')]
+        return [self.suggestions[i] for i in ranked[:limit]]
@@ -0,0 +1,87 @@
+"""
+"Players like X": nearest neighbours over standardized stat vectors.
+
+The feature list is shared with NBAAISystem.prepare_data.  Each store
+standardizes those columns, L2-normalizes every row and computes the full
+cosine k-NN graph in row blocks on first use; a lookup afterwards is a
+slice of that graph.
+"""
+
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+FEATURE_COLUMNS = (
+    'HEIGHT', 'WEIGHT', 'AGE',
+    'PPG_LAST', 'APG_LAST', 'RPG_LAST', 'SPG_LAST', 'BPG_LAST',
+    'TOV_LAST', 'FG_PCT_LAST', 'FG3_PCT_LAST', 'FT_PCT_LAST', 'MIN_LAST',
+    'GAMES_PLAYED_LAST', 'PPG_PREV', 'APG_PREV', 'RPG_PREV',
+    'SPG_PREV', 'BPG_PREV', 'TOV_PREV', 'FG_PCT_PREV', 'FG3_PCT_PREV',
+    'FT_PCT_PREV', 'MIN_PREV', 'GAMES_PLAYED_PREV',
+    'PPG_LAST_10', 'APG_LAST_10', 'RPG_LAST_10', 'FG_PCT_LAST_10',
+    'PPG_TREND', 'APG_TREND', 'RPG_TREND',
+    'PPG_STD', 'APG_STD', 'RPG_STD', 'CONSISTENCY_SCORE',
+)
+
+DEFAULT_NEIGHBORS = 5
+MAX_NEIGHBORS = 20
+BLOCK_ROWS = 1024
+
+
+def feature_matrix(store) -> Tuple[List[str], np.ndarray]:
+    """Standardized, L2-normalized rows over the FEATURE_COLUMNS the store has."""
+    features = [c for c in FEATURE_COLUMNS if c in store.columns]
+    if not features:
+        return features, np.zeros((store.size, 0))
+    matrix = np.column_stack([np.nan_to_num(store.column(c)) for c in features])
+    std = matrix.std(axis=0)
+    matrix = (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return features, matrix / np.where(norms > 0, norms, 1.0)
+
+
+def knn_graph(matrix: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(neighbours, similarities), each (rows, k), best first; a row never lists itself."""
+    n = len(matrix)
+    k = min(k, n - 1)
+    neighbours = np.zeros((n, max(k, 0)), dtype=np.int32)
+    similarities = np.zeros((n, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return neighbours, similarities
+
+    for start in range(0, n, BLOCK_ROWS):
+        block = matrix[start:start + BLOCK_ROWS] @ matrix.T
+        rows = np.arange(len(block))
+        block[rows, rows + start] = -np.inf
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(block, top, axis=1)
+        # Equal similarities list the lower row first.
+        order = np.lexsort((top, -top_sims), axis=1)
+        neighbours[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+        similarities[start:start + len(block)] = np.take_along_axis(top_sims, order, axis=1)
+    return neighbours, similarities
+
+
+class SimilarityIndex:
+    """Cosine k-NN graph over one PlayerStore, built on first lookup."""
+
+    def __init__(self, store):
+        self.store = store
+        self.features: List[str] = []
+        self._graph: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._graph_lock = threading.Lock()
+
+    def graph(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._graph is None:
+            with self._graph_lock:
+                if self._graph is None:
+                    self.features, matrix = feature_matrix(self.store)
+                    self._graph = knn_graph(matrix, MAX_NEIGHBORS)
+        return self._graph
+
+    def neighbours(self, row: int, k: int = DEFAULT_NEIGHBORS) -> List[Tuple[int, float]]:
+        """Up to k (row, cosine similarity) pairs, most similar first."""
+        neighbours, similarities = self.graph()
+        k = min(max(k, 0), neighbours.shape[1])
+        return list(zip(neighbours[row, :k].tolist(), similarities[row, :k].tolist()))
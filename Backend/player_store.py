@@ -0,0 +1,491 @@
+"""
+Columnar in-memory store for the season player data.
+
+Built once from the list of player dicts loaded from the season pickle:
+every numeric stat becomes a NumPy column, TEAM/POSITION become categorical
+codes and player names are kept as an interned object array.  Route handlers
+filter and sort against these arrays instead of scanning the dicts.
+"""
+
+import base64
+import itertools
+import json
+import re
+import sys
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from leaders import LeadersEngine
+from player_index import PlayerIndex
+from player_percentiles import compute_percentiles
+from player_summaries import materialize_summaries, name_id, project_summaries, record_value
+from player_search import FuzzyIndex, NgramIndex, PrefixIndex, AUTOCOMPLETE_LIMIT, MAX_EDIT_DISTANCE
+from player_similarity import SimilarityIndex
+from teams import TEAM_ALIASES, TeamAggregates, is_team
+
+SORT_KEY_MAP = {
+    'name': ('PLAYER_NAME', str),
+    'team': ('TEAM', str),
+    'position': ('POSITION', str),
+    'ppg': ('PPG_LAST', float),
+    'apg': ('APG_LAST', float),
+    'rpg': ('RPG_LAST', float),
+    'spg': ('SPG_LAST', float),
+    'bpg': ('BPG_LAST', float),
+    'fg_pct': ('FG_PCT_LAST', float),
+    'fg3_pct': ('FG3_PCT_LAST', float),
+    'ft_pct': ('FT_PCT_LAST', float),
+    'games': ('GAMES_PLAYED_LAST', float),
+    'age': ('AGE', float),
+}
+
+STRING_COLUMNS = ('PLAYER_NAME', 'TEAM', 'POSITION')
+
+# (stat key, raw column) pairs that get percentile and z-score columns.
+PERCENTILE_STATS = tuple((key, raw_key) for key, (raw_key, cast) in SORT_KEY_MAP.items() if cast is not str)
+
+MAX_SORT_KEYS = 4
+
+# Numeric sort keys double as the columns a `where=` filter may test.
+FILTER_KEYS = tuple(key for key, (_, cast) in SORT_KEY_MAP.items() if cast is not str)
+MAX_WHERE_CONDITIONS = 12
+MAX_WHERE_LENGTH = 200
+_CONDITION = re.compile(r'^\s*([a-z0-9_]+)\s*(>=|<=|==|=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$')
+
+_ABSENT = object()
+
+# Every store gets a new version, so caches keyed on it turn over on reload.
+_versions = itertools.count(1)
+
+
+def parse_sort(sort_by: str, sort_order: str = 'asc') -> List[Tuple[str, bool]]:
+    """Turn `sort_by=team,ppg&sort_order=asc,desc` into [(key, descending), ...].
+
+    Unknown keys are dropped; a single sort_order applies to every key.
+    Falls back to sorting by name like the original handler did.
+    """
+    keys = [k.strip().lower() for k in (sort_by or '').split(',') if k.strip()][:MAX_SORT_KEYS]
+    orders = [o.strip().lower() for o in (sort_order or '').split(',')]
+    if len(orders) == 1:
+        orders = orders * max(len(keys), 1)
+    spec = []
+    for i, key in enumerate(keys):
+        if key not in SORT_KEY_MAP or any(key == k for k, _ in spec):
+            continue
+        spec.append((key, i < len(orders) and orders[i] == 'desc'))
+    return spec or [('name', orders[0] == 'desc')]
+
+
+def encode_cursor(sort_by: str, descending: bool, value, player_id: int) -> str:
+    """Opaque keyset cursor: the sort key, direction and the last row's (value, id)."""
+    raw = json.dumps({'k': sort_by, 'd': int(descending), 'v': value, 'i': player_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, bool, Tuple[object, int]]]:
+    """(sort_by, descending, (value, id)) from encode_cursor, or None if it is malformed.
+
+    Cursors come from clients, so every field is type-checked: the key must
+    be a SORT_KEY_MAP key, and the value a string for text keys or a real
+    number (not a bool) for numeric ones.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        sort_by, descending, value, player_id = raw['k'], raw['d'], raw['v'], raw['i']
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(sort_by, str) or sort_by not in SORT_KEY_MAP:
+        return None
+    if not isinstance(descending, int) or not isinstance(player_id, int) or isinstance(player_id, bool):
+        return None
+    if SORT_KEY_MAP[sort_by][1] is str:
+        if not isinstance(value, str):
+            return None
+    elif isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return sort_by, bool(descending), (value, player_id)
+
+
+def parse_where(where: str) -> List[Tuple[str, float, float]]:
+    """Turn `where=ppg>=20,apg>=5,fg3_pct>=38` into [(key, low, high), ...].
+
+    Keys must be numeric SORT_KEY_MAP keys; conditions on the same key are
+    intersected.  Strict bounds become inclusive ones one float step inside,
+    so every condition is a closed range.  Percentage keys take either a
+    fraction (0.38) or a percentage (38).  Raises ValueError on bad input,
+    including filters too long to take whole (never truncated).
+    """
+    if len(where or '') > MAX_WHERE_LENGTH:
+        raise ValueError(f'where must be at most {MAX_WHERE_LENGTH} characters')
+    conditions = [c for c in (where or '').split(',') if c.strip()]
+    if len(conditions) > MAX_WHERE_CONDITIONS:
+        raise ValueError(f'At most {MAX_WHERE_CONDITIONS} where conditions')
+
+    bounds: Dict[str, List[float]] = {}
+    for condition in conditions:
+        match = _CONDITION.match(condition.lower())
+        if not match:
+            raise ValueError(f'Invalid where condition: {condition.strip()}')
+        key, op, number = match.group(1), match.group(2), float(match.group(3))
+        if key not in FILTER_KEYS:
+            raise ValueError(f"Unknown where field: {key}. Use one of: {', '.join(FILTER_KEYS)}")
+        if key.endswith('_pct') and number > 1:
+            number /= 100.0
+
+        low, high = bounds.setdefault(key, [-np.inf, np.inf])
+        if op in ('>=', '>', '=', '=='):
+            low = max(low, np.nextafter(number, np.inf) if op == '>' else number)
+        if op in ('<=', '<', '=', '=='):
+            high = min(high, np.nextafter(number, -np.inf) if op == '<' else number)
+        bounds[key] = [low, high]
+    return [(key, low, high) for key, (low, high) in bounds.items()]
+
+
+def _categorical(values: List[str]):
+    """Sorted labels plus int16 codes into them."""
+    labels, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return [str(label) for label in labels], codes.astype(np.int16)
+
+
+def _bitsets(codes: np.ndarray, n_labels: int) -> np.ndarray:
+    """One boolean row per label, True where that row has the label."""
+    bits = np.zeros((n_labels, len(codes)), dtype=bool)
+    bits[codes, np.arange(len(codes))] = True
+    return bits
+
+
+def _rank(values: np.ndarray):
+    """Sorted distinct values plus each row's dense rank among them."""
+    labels, inverse = np.unique(values, return_inverse=True)
+    return [str(label) for label in labels], inverse.astype(np.int32)
+
+
+class PlayerStore:
+    """Read-only columnar view over one loaded season of player records."""
+
+    def __init__(self, records: Sequence[Dict], known_teams: Iterable[str] = (), columnar=None):
+        """`columnar` is the ColumnarData the records were read from, if any.
+
+        With it, everything is built from the mapped columns and `records`
+        (a lazy ColumnarRecords) is only read for the rows callers ask for.
+        """
+        self.records = records
+        self.columnar = columnar
+        self.size = len(records)
+        self.version = next(_versions)
+
+        self.names = np.array(
+            [sys.intern(str(name)) for name in self.field('PLAYER_NAME', '')], dtype=object
+        )
+        self.names_lower = np.array([n.lower() for n in self.names], dtype=object)
+        self.ids = np.array([name_id(name) if pid is None else pid
+                             for pid, name in zip(self.field('PLAYER_ID'), self.field('PLAYER_NAME', 'Unknown'))],
+                            dtype=np.int64)
+        self.index = PlayerIndex(self.ids.tolist(), self.names)
+        self.search_index = NgramIndex(self.names)
+
+        self.team_labels, self.team_codes = _categorical([team or '' for team in self.field('TEAM', '')])
+        self.position_labels, self.position_codes = _categorical(
+            [position or '' for position in self.field('POSITION', '')]
+        )
+
+        self.team_lookup = {label: i for i, label in enumerate(self.team_labels)}
+        self.position_lookup = {label: i for i, label in enumerate(self.position_labels)}
+        self.team_bits = _bitsets(self.team_codes, len(self.team_labels))
+        self.position_bits = _bitsets(self.position_codes, len(self.position_labels))
+        self._no_rows = np.zeros(self.size, dtype=bool)
+
+        self.columns: Dict[str, np.ndarray] = {}
+        self.missing: Dict[str, np.ndarray] = {}
+        self._load_numeric_columns(columnar)
+        self.percentile_stats = PERCENTILE_STATS
+        # Row-major copy of the filterable columns so where= tests them in one pass.
+        self.filter_matrix = np.column_stack([self.column(SORT_KEY_MAP[key][0]) for key in FILTER_KEYS])
+        self.filter_slots = {key: i for i, key in enumerate(FILTER_KEYS)}
+        self.columns.update(compute_percentiles(self, PERCENTILE_STATS))
+        self.fuzzy_index = FuzzyIndex(self.names, scores=self.column('PPG_LAST'))
+        self.autocomplete_index = self._build_autocomplete(known_teams)
+        self.summaries, self.summary_json, self.summary_columns = materialize_summaries(self)
+
+        name_labels, name_ranks = _rank(self.names_lower)
+        self._sort_values = {
+            'PLAYER_NAME': name_ranks,
+            'TEAM': self.team_codes,
+            'POSITION': self.position_codes,
+        }
+        # String keys sort by rank; these map a rank back to its (lower-case) value.
+        self._sort_labels = {
+            'PLAYER_NAME': name_labels,
+            'TEAM': [label.lower() for label in self.team_labels],
+            'POSITION': [label.lower() for label in self.position_labels],
+        }
+        for key, (raw_key, cast) in SORT_KEY_MAP.items():
+            if cast is not str:
+                self._sort_values[raw_key] = self.column(raw_key)
+
+        # Ascending and descending permutation of every row for each sort key.
+        # Both are stable, so ties keep load order exactly like list.sort did.
+        self.sort_orders: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for key, (raw_key, _) in SORT_KEY_MAP.items():
+            values = self._sort_values[raw_key]
+            self.sort_orders[key] = (
+                np.argsort(values, kind='stable').astype(np.int32),
+                np.argsort(-values.astype(np.float64), kind='stable').astype(np.int32),
+            )
+
+        # Keyset orders break ties on PLAYER_ID instead of load order, so a
+        # (value, id) cursor points at the same place in any later reload.
+        self.keyset_orders: Dict[str, np.ndarray] = {}
+        self.keyset_values: Dict[str, np.ndarray] = {}
+        for key, (raw_key, _) in SORT_KEY_MAP.items():
+            perm = np.lexsort((self.ids, self._sort_values[raw_key])).astype(np.int32)
+            self.keyset_orders[key] = perm
+            self.keyset_values[key] = self._sort_values[raw_key][perm].astype(np.float64)
+
+        self.leaders = LeadersEngine(self)
+        self.similarity = SimilarityIndex(self)
+        self.teams = TeamAggregates(self)
+
+    def __len__(self):
+        return self.size
+
+    def field(self, key: str, default=None) -> List:
+        """record_value(record, key, default) for every row, without building dicts when mapped."""
+        if self.columnar is None:
+            return [record_value(r, key, default) for r in self.records]
+        values = self.columnar.field(key, _ABSENT)
+        if key.lower() != key and any(v is _ABSENT for v in values):
+            fallback = self.columnar.field(key.lower(), default)
+            return [fallback[row] if v is _ABSENT else v for row, v in enumerate(values)]
+        return [default if v is _ABSENT else v for v in values]
+
+    def _load_numeric_columns(self, columnar=None):
+        """One float column per numeric field, keyed by its upper-case name.
+
+        Fields already stored as columns in a memory-mapped data file are
+        used as they are, without going back through the dicts.
+        """
+        mapped = columnar.float_columns() if columnar is not None else {}
+        numeric_keys = set()
+        if mapped:
+            numeric_keys.update(key.upper() for key in mapped)
+        else:
+            for r in self.records:
+                for key, value in r.items():
+                    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                        numeric_keys.add(key.upper())
+        numeric_keys.update(raw_key for raw_key, cast in SORT_KEY_MAP.values() if cast is not str)
+        numeric_keys.difference_update(STRING_COLUMNS + ('PLAYER_ID',))
+
+        for key in sorted(numeric_keys):
+            if key in mapped:
+                values, missing = mapped[key]
+                self.columns[key] = values
+                if missing is not None and missing.any():
+                    self.missing[key] = missing
+                continue
+            values = np.array(self.field(key), dtype=object)
+            missing = np.array([v is None for v in values], dtype=bool)
+            values[missing] = 0.0
+            self.columns[key] = values.astype(np.float64)
+            if missing.any():
+                self.missing[key] = missing
+
+    def _build_autocomplete(self, known_teams: Iterable[str]) -> PrefixIndex:
+        """Players score by PPG, teams by roster PPG total, positions by head count."""
+        ppg = self.column('PPG_LAST')
+        team_ppg = np.bincount(self.team_codes, weights=ppg, minlength=len(self.team_labels))
+        position_counts = np.bincount(self.position_codes, minlength=len(self.position_labels))
+
+        entries = []
+        for row in range(self.size):
+            entries.append(({
+                'type': 'player',
+                'label': self.names[row],
+                'id': int(self.ids[row]),
+                'team': self.team_labels[self.team_codes[row]],
+            }, self.names[row], float(ppg[row])))
+
+        # One suggestion per franchise, under the label ?team= filters on:
+        # live-feed tricodes map to the season data's, and '2TM'-style rows are skipped.
+        teams = {label: float(team_ppg[code]) for code, label in enumerate(self.team_labels) if is_team(label)}
+        for tricode in known_teams:
+            teams.setdefault(TEAM_ALIASES.get(tricode, tricode), 0.0)
+        for tricode, score in teams.items():
+            entries.append(({'type': 'team', 'label': tricode}, tricode, score))
+
+        for code, label in enumerate(self.position_labels):
+            if label:
+                entries.append(({'type': 'position', 'label': label}, label, float(position_counts[code])))
+        return PrefixIndex(entries)
+
+    def column(self, key: str) -> np.ndarray:
+        """Numeric column by raw key; absent columns read as zeros."""
+        col = self.columns.get(key)
+        if col is None:
+            col = np.zeros(self.size, dtype=np.float64)
+        return col
+
+    def filter_mask(self, search: str = '', team: str = '', position: str = '') -> np.ndarray:
+        """Boolean mask of rows matching the name substring, team and position.
+
+        The substring match is accent-insensitive: 'doncic' finds 'Dončić'.
+        """
+        mask = self.search_index.mask(search) if search else np.ones(self.size, dtype=bool)
+        if team:
+            mask &= self.team_mask(team)
+        if position:
+            mask &= self.position_mask(position)
+        return mask
+
+    def where_mask(self, conditions: List[Tuple[str, float, float]]) -> np.ndarray:
+        """Rows satisfying every parse_where() range, in a single vectorized pass."""
+        if not conditions:
+            return np.ones(self.size, dtype=bool)
+        slots = [self.filter_slots[key] for key, _, _ in conditions]
+        low = np.array([low for _, low, _ in conditions])
+        high = np.array([high for _, _, high in conditions])
+        values = self.filter_matrix[:, slots]
+        return ((values >= low) & (values <= high)).all(axis=1)
+
+    def team_mask(self, team: str) -> np.ndarray:
+        code = self.team_lookup.get(team)
+        return self._no_rows if code is None else self.team_bits[code]
+
+    def position_mask(self, position: str) -> np.ndarray:
+        code = self.position_lookup.get(position)
+        return self._no_rows if code is None else self.position_bits[code]
+
+    def facet_counts(self, search: str = '', team: str = '', position: str = '') -> Dict:
+        """Per-team and per-position counts for the current filter, from the bitsets.
+
+        Each facet ignores its own selection (team counts apply the search and
+        position filters, not the team filter), so the UI can show how many
+        players switching to another team or position would give.
+        """
+        base = self.search_index.mask(search) if search else np.ones(self.size, dtype=bool)
+        team_filter = self.team_mask(team) if team else None
+        position_filter = self.position_mask(position) if position else None
+
+        for_teams = base if position_filter is None else base & position_filter
+        for_positions = base if team_filter is None else base & team_filter
+        team_counts = np.count_nonzero(self.team_bits & for_teams, axis=1)
+        position_counts = np.count_nonzero(self.position_bits & for_positions, axis=1)
+        total = for_teams if team_filter is None else for_teams & team_filter
+
+        return {
+            'total': int(np.count_nonzero(total)),
+            'teams': [{'team': label, 'count': int(count)}
+                      for label, count in zip(self.team_labels, team_counts)],
+            'positions': [{'position': label, 'count': int(count)}
+                          for label, count in zip(self.position_labels, position_counts)],
+        }
+
+    def order(self, sort_by: str = 'name', descending: bool = False) -> np.ndarray:
+        """Precomputed permutation of all rows for a single SORT_KEY_MAP key."""
+        asc, desc = self.sort_orders.get(sort_by, self.sort_orders['name'])
+        return desc if descending else asc
+
+    def ordered_rows(self, mask: np.ndarray, spec: List[Tuple[str, bool]]) -> np.ndarray:
+        """Row positions passing `mask`, ordered by a parse_sort() spec."""
+        if len(spec) == 1:
+            perm = self.order(*spec[0])
+            return perm[mask[perm]]
+
+        rows = np.flatnonzero(mask)
+        sort_keys = []
+        for key, descending in reversed(spec):
+            values = self._sort_values[SORT_KEY_MAP[key][0]][rows]
+            sort_keys.append(-values.astype(np.float64) if descending else values)
+        return rows[np.lexsort(sort_keys)]
+
+    def record_for_name(self, name: str) -> Optional[Dict]:
+        row = self.index.row_for_name(name)
+        return None if row is None else self.records[row]
+
+    def search_rows(self, search: str) -> np.ndarray:
+        return self.search_index.search(search)
+
+    def fuzzy_rows(self, query: str, max_distance: int = MAX_EDIT_DISTANCE, limit: int = 10) -> List[Tuple[int, int]]:
+        """(row, edit distance) pairs for a possibly misspelled name, best first."""
+        return self.fuzzy_index.search(query, max_distance, limit)
+
+    def autocomplete(self, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> List[Dict]:
+        return self.autocomplete_index.complete(prefix, limit)
+
+    def sort_value(self, sort_by: str, row: int):
+        """The value a cursor records for `row`: the number, or the lower-cased string."""
+        raw_key, cast = SORT_KEY_MAP[sort_by]
+        if cast is str:
+            return self._sort_labels[raw_key][int(self._sort_values[raw_key][row])]
+        return float(self._sort_values[raw_key][row])
+
+    def _sort_coordinate(self, sort_by: str, value) -> float:
+        """Position of a cursor value on this store's sort axis.
+
+        Numbers are used as they are.  Strings map to their rank, or to the
+        midpoint between ranks when the value no longer exists after a reload.
+        """
+        raw_key, cast = SORT_KEY_MAP[sort_by]
+        if cast is not str:
+            return float(value)
+        labels = self._sort_labels[raw_key]
+        i = bisect_left(labels, str(value))
+        return float(i) if i < len(labels) and labels[i] == value else i - 0.5
+
+    def keyset_page(self, mask: np.ndarray, sort_by: str, descending: bool,
+                    after: Optional[Tuple[object, int]], limit: int) -> Tuple[np.ndarray, bool]:
+        """Up to `limit` rows passing `mask` that follow the (value, id) cursor `after`.
+
+        Starts from a binary search in the precomputed keyset order and only
+        walks forward as far as it needs to, so cost doesn't grow with depth.
+        Returns the rows and whether more remain.
+        """
+        perm = self.keyset_orders[sort_by]
+        if after is None:
+            start = len(perm) - 1 if descending else 0
+        else:
+            values = self.keyset_values[sort_by]
+            coordinate = self._sort_coordinate(sort_by, after[0])
+            lo = int(np.searchsorted(values, coordinate, 'left'))
+            hi = int(np.searchsorted(values, coordinate, 'right'))
+            ids = self.ids[perm[lo:hi]]
+            if descending:
+                start = lo + int(np.searchsorted(ids, after[1], 'left')) - 1
+            else:
+                start = lo + int(np.searchsorted(ids, after[1], 'right'))
+
+        found = []
+        need = limit + 1
+        chunk = max(need * 4, 64)
+        while need > 0 and 0 <= start < len(perm):
+            if descending:
+                window = perm[max(start - chunk + 1, 0):start + 1][::-1]
+                start -= chunk
+            else:
+                window = perm[start:start + chunk]
+                start += chunk
+            hits = window[mask[window]][:need]
+            found.append(hits)
+            need -= len(hits)
+
+        rows = np.concatenate(found) if found else np.empty(0, dtype=np.int32)
+        return rows[:limit], len(rows) > limit
+
+    def summaries_for(self, rows, paths: Optional[List[str]] = None) -> List[Dict]:
+        """Summaries of `rows`; only the given SUMMARY_FIELDS paths when `paths` is set."""
+        if paths is None:
+            return [self.summaries[row] for row in rows]
+        return project_summaries(self.summary_columns, rows, paths)
+
+    def rows(self, positions) -> List[Dict]:
+        return [self.records[i] for i in positions]
+
+
+def build_player_store(records: Optional[Sequence[Dict]], known_teams: Iterable[str] = (),
+                       columnar=None) -> Optional[PlayerStore]:
+    if not records:
+        return None
+    return PlayerStore(records, known_teams, columnar)
@@ -0,0 +1,217 @@
+"""
+Player summary payloads served by the /api/players routes.
+
+get_player_stats_summary() builds one summary from a raw player dict.
+materialize_summaries() builds every summary of a PlayerStore in one pass at
+load time, together with its pre-encoded JSON, so page requests only have to
+pick rows and concatenate bytes.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from player_percentiles import PERCENTILE_KINDS
+from serialization import dumps
+
+# (trend key, hash label, per-game column, scale factor, scale cap)
+TREND_SPECS = (
+    ('PPG_TREND', 'ppg', 'PPG_LAST', 0.25, 4.0),
+    ('APG_TREND', 'apg', 'APG_LAST', 0.3, 2.0),
+    ('RPG_TREND', 'rpg', 'RPG_LAST', 0.25, 2.0),
+)
+
+# summary stats key -> (column, multiplier)
+STAT_FIELDS = (
+    ('ppg_last', 'PPG_LAST', 1),
+    ('apg_last', 'APG_LAST', 1),
+    ('rpg_last', 'RPG_LAST', 1),
+    ('spg_last', 'SPG_LAST', 1),
+    ('bpg_last', 'BPG_LAST', 1),
+    ('fg_pct_last', 'FG_PCT_LAST', 100),
+    ('fg3_pct_last', 'FG3_PCT_LAST', 100),
+    ('ft_pct_last', 'FT_PCT_LAST', 100),
+)
+
+
+def record_value(record: Dict, key: str, default=None):
+    """Field by its upper-case key, falling back to the lower-case spelling."""
+    return record.get(key, record.get(key.lower(), default))
+
+
+def name_id(name: str) -> int:
+    """Fallback player id from a digest of the normalized name.
+
+    Unlike hash(), which is salted per process, it is the same in every
+    worker, so ids, cursors and ETags don't depend on who answers.
+    """
+    return _md5_seed(' '.join(name.split()).lower()) % (10**9)
+
+
+def encode_json(obj) -> bytes:
+    """Encode exactly like the app's jsonify (sorted keys, compact)."""
+    return dumps(obj)
+
+
+def _md5_seed(text: str) -> int:
+    return int(hashlib.md5(text.encode()).hexdigest(), 16)
+
+
+def _deterministic_trend(name, stat, scale=3.0):
+    """Generate a stable, deterministic trend value based on player name + stat."""
+    seed = _md5_seed(f"{name}_{stat}")
+    raw = ((seed % 10000) / 10000.0) * 2 - 1
+    return round(raw * scale, 1)
+
+
+def _deterministic_consistency(name, ppg):
+    """Generate a stable consistency score (0.0 – 1.0) based on name + ppg."""
+    seed = _md5_seed(f"{name}_consistency")
+    base = (seed % 1000) / 1000.0
+    ppg_bonus = min(ppg / 40.0, 0.3) if ppg else 0
+    return round(min(1.0, base * 0.7 + ppg_bonus + 0.15), 2)
+
+
+def get_player_stats_summary(player_data, percentiles=None):
+    ppg_current = player_data.get('PPG_LAST', player_data.get('ppg_last', 0))
+    apg_current = player_data.get('APG_LAST', player_data.get('apg_last', 0))
+    rpg_current = player_data.get('RPG_LAST', player_data.get('rpg_last', 0))
+    name = player_data.get('PLAYER_NAME', player_data.get('player_name', 'Unknown'))
+
+    ppg_trend = record_value(player_data, 'PPG_TREND', _deterministic_trend(name, 'ppg', scale=min(ppg_current * 0.25, 4.0)))
+    apg_trend = record_value(player_data, 'APG_TREND', _deterministic_trend(name, 'apg', scale=min(apg_current * 0.3, 2.0)))
+    rpg_trend = record_value(player_data, 'RPG_TREND', _deterministic_trend(name, 'rpg', scale=min(rpg_current * 0.25, 2.0)))
+    consistency = record_value(player_data, 'CONSISTENCY_SCORE', _deterministic_consistency(name, ppg_current))
+
+    summary = {
+        'id': player_data.get('PLAYER_ID', player_data.get('player_id', name_id(name))),
+        'name': name,
+        'team': player_data.get('TEAM', player_data.get('team', 'UNK')),
+        'position': player_data.get('POSITION', player_data.get('position', 'UNK')),
+        'age': player_data.get('AGE', player_data.get('age', 0)),
+        'stats': {
+            'ppg_last': round(ppg_current, 1),
+            'apg_last': round(apg_current, 1),
+            'rpg_last': round(rpg_current, 1),
+            'spg_last': round(player_data.get('SPG_LAST', player_data.get('spg_last', 0)), 1),
+            'bpg_last': round(player_data.get('BPG_LAST', player_data.get('bpg_last', 0)), 1),
+            'fg_pct_last': round(player_data.get('FG_PCT_LAST', player_data.get('fg_pct_last', 0)) * 100, 1),
+            'fg3_pct_last': round(player_data.get('FG3_PCT_LAST', player_data.get('fg3_pct_last', 0)) * 100, 1),
+            'ft_pct_last': round(player_data.get('FT_PCT_LAST', player_data.get('ft_pct_last', 0)) * 100, 1),
+            'games_played': int(player_data.get('GAMES_PLAYED_LAST', player_data.get('games_played_last', 0)) or 0)
+        },
+        'trends': {
+            'ppg_trend': round(ppg_trend, 1),
+            'apg_trend': round(apg_trend, 1),
+            'rpg_trend': round(rpg_trend, 1),
+            'consistency_score': round(consistency, 2)
+        }
+    }
+    if percentiles is not None:
+        summary['percentiles'] = percentiles
+    return summary
+
+
+def _stored_or(store, key: str, computed: np.ndarray) -> np.ndarray:
+    """Values the season file already carries for `key`, `computed` where it doesn't."""
+    if key not in store.columns:
+        return computed
+    missing = store.missing.get(key)
+    if missing is None:
+        return store.columns[key]
+    return np.where(missing, computed, store.columns[key])
+
+
+def _rounded(values: np.ndarray, digits: int) -> List[float]:
+    # Python's round() rather than np.round so values match get_player_stats_summary
+    # to the last digit (np.round scales by 10**digits and can round the other way).
+    return [round(v, digits) for v in values.tolist()]
+
+
+SUMMARY_FIELDS = (
+    'id', 'name', 'team', 'position', 'age',
+    *(f'stats.{field}' for field, _, _ in STAT_FIELDS), 'stats.games_played',
+    'trends.ppg_trend', 'trends.apg_trend', 'trends.rpg_trend', 'trends.consistency_score',
+    'percentiles',
+)
+
+
+def materialize_summaries(store) -> Tuple[List[Dict], List[bytes], Dict[str, List]]:
+    """Every row's summary dict, its JSON encoding, and the summary as columns.
+
+    Same output as calling get_player_stats_summary on each record with its
+    percentiles, but the key casing is resolved once by the store and the
+    trend/consistency maths runs over whole columns; only the MD5 seeds are
+    per player.  The columns
+    (one list per dotted SUMMARY_FIELDS path) back field projection.
+    """
+    names = store.field('PLAYER_NAME', 'Unknown')
+
+    columns: Dict[str, List] = {
+        'id': store.ids.tolist(),
+        'name': names,
+        'team': store.field('TEAM', 'UNK'),
+        'position': store.field('POSITION', 'UNK'),
+        'age': store.field('AGE', 0),
+    }
+    for field, column, multiplier in STAT_FIELDS:
+        columns[f'stats.{field}'] = _rounded(store.column(column) * multiplier, 1)
+    columns['stats.games_played'] = store.column('GAMES_PLAYED_LAST').astype(np.int64).tolist()
+
+    for key, label, column, factor, cap in TREND_SPECS:
+        raw = np.array([_md5_seed(f"{name}_{label}") % 10000 for name in names], dtype=np.float64)
+        raw = (raw / 10000.0) * 2 - 1
+        scale = np.minimum(store.column(column) * factor, cap)
+        computed = np.array(_rounded(raw * scale, 1), dtype=np.float64)
+        columns[f'trends.{label}_trend'] = _rounded(_stored_or(store, key, computed), 1)
+
+    ppg = store.column('PPG_LAST')
+    base = np.array([_md5_seed(f"{name}_consistency") % 1000 for name in names], dtype=np.float64) / 1000.0
+    ppg_bonus = np.where(ppg != 0, np.minimum(ppg / 40.0, 0.3), 0)
+    computed = np.array(_rounded(np.minimum(1.0, base * 0.7 + ppg_bonus + 0.15), 2), dtype=np.float64)
+    columns['trends.consistency_score'] = _rounded(_stored_or(store, 'CONSISTENCY_SCORE', computed), 2)
+    columns['percentiles'] = percentile_summaries(store)
+
+    summaries = project_summaries(columns, range(store.size), SUMMARY_FIELDS)
+    return summaries, [encode_json(summary) for summary in summaries], columns
+
+
+def percentile_summaries(store) -> List[Dict]:
+    """Per row: {stat: {'league', 'position', 'league_z', 'position_z'}} from the store's columns."""
+    per_stat = [
+        (stat, [(name, _rounded(store.columns[f'{raw_key}_{suffix}'], 2 if name.endswith('_z') else 1))
+                for suffix, name in PERCENTILE_KINDS])
+        for stat, raw_key in store.percentile_stats
+    ]
+    return [{stat: {name: values[row] for name, values in kinds} for stat, kinds in per_stat}
+            for row in range(store.size)]
+
+
+def expand_fields(fields: List[str]) -> Tuple[List[str], List[str]]:
+    """Resolve requested fields to SUMMARY_FIELDS paths; returns (paths, unknown).
+
+    A bare group name such as 'stats' selects every field inside it.
+    """
+    paths, unknown = [], []
+    for field in fields:
+        matches = [path for path in SUMMARY_FIELDS if path == field or path.startswith(field + '.')]
+        if not matches:
+            unknown.append(field)
+        paths.extend(path for path in matches if path not in paths)
+    return paths, unknown
+
+
+def project_summaries(columns: Dict[str, List], rows: Iterable[int], paths: Sequence[str]) -> List[Dict]:
+    """Summary dicts holding only `paths`, read straight from the summary columns."""
+    selected = [(path.split('.'), columns[path]) for path in paths]
+    out = []
+    for row in rows:
+        item = {}
+        for parts, values in selected:
+            if len(parts) == 1:
+                item[parts[0]] = values[row]
+            else:
+                item.setdefault(parts[0], {})[parts[1]] = values[row]
+        out.append(item)
+    return out
@@ -1,4 +1,7 @@
+import threading
+
 import numpy as np
+from dataset import dataset
 from nba_ai_system import STAT_SCALE, initialize_nba_ai, nba_ai_system
 
 LIMIT = 20
@@ -23,24 +26,23 @@ def _ensure_ai():
     if not initialize_nba_ai():
         raise RuntimeError('AI system failed to initialize. Check nba_ai_model.pkl and nba_2025_26_data.pkl in Backend/.')
 
-def _jsonify_records(records):
-    out = []
-    for row in records:
-        clean = {}
-        for key, value in row.items():
-            if isinstance(value, (np.floating, np.integer)):
-                clean[key] = value.item()
-            elif value is None or (isinstance(value, float) and np.isnan(value)):
-                clean[key] = None
-            else:
-                clean[key] = value
-        out.append(clean)
-    return out
-
-def _build_predictions_df():
+_predictions = None
+_predictions_lock = threading.Lock()
+
+def _predictions_df():
+    """_build_predictions_df() for the live season, run once per data version."""
+    global _predictions
+    _ensure_ai()
+    snapshot = dataset.snapshot
+    with _predictions_lock:
+        if _predictions is None or _predictions[0] != snapshot.version:
+            _predictions = (snapshot.version, _build_predictions_df(snapshot))
+        return _predictions[1]
+
+def _build_predictions_df(snapshot=None):
     """All players with predicted stats and % improvement per category."""
     _ensure_ai()
-    X, _, df = nba_ai_system.prepare_data()
+    X, _, df = nba_ai_system.prepare_data(snapshot)
     preds = nba_ai_system.predict(X)
     if preds is None:
         return None
@@ -76,7 +78,7 @@ def get_top_by_improvement(stat, limit=LIMIT):
     if not sort_col:
         return None
 
-    results = _build_predictions_df()
+    results = _predictions_df()
     if results is None:
         return []
 
@@ -84,7 +86,8 @@ def get_top_by_improvement(stat, limit=LIMIT):
     results = results[results[pred_col] > min_pred]
 
     top = results.nlargest(limit, sort_col)
-    return _jsonify_records(top.to_dict(orient='records'))
+    # NumPy scalars and NaN are handled by the app's JSON encoder.
+    return top.to_dict(orient='records')
 
 def get_top_performers(stat):
     return get_top_by_improvement(stat)
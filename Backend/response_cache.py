@@ -0,0 +1,135 @@
+"""
+Versioned response cache for read-only, data-derived endpoints.
+
+Responses are keyed by route, normalized query args and the version the
+route depends on (the loaded season, or the season plus a feed's fetch time
+for live games); a new version simply stops matching old entries, which then
+age out of the LRU.  Every cached response carries a strong ETag and answers a matching
+If-None-Match with 304 without touching the view at all.  Compressed bodies
+are produced once per entry and encoding, not once per request, and routes
+that negotiate JSON/MessagePack keep one entry per format.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Hashable, Optional
+
+from flask import Response, current_app, request
+
+from compression import MIN_COMPRESS_SIZE, compress, negotiate_encoding
+from serialization import response_format
+
+MAX_ENTRIES = 512
+DEFAULT_MAX_AGE = 60
+
+
+class CachedResponse:
+    def __init__(self, body: bytes, mimetype: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.encoded = {}
+        self._encode_lock = threading.Lock()
+
+    def body_for(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        body = self.encoded.get(encoding)
+        if body is None:
+            with self._encode_lock:
+                body = self.encoded.get(encoding)
+                if body is None:
+                    body = self.encoded[encoding] = compress(self.body, encoding, cached=True)
+        return body
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """Strong ETags must differ per representation, so encodings get a suffix."""
+        return self.etag if encoding is None else f'{self.etag}-{encoding}'
+
+
+class ResponseCache:
+    """Thread-safe LRU of CachedResponse entries.
+
+    Routes key on different versions (data version vs. feed fetch time), so a
+    new version never clears the cache; stale entries are evicted by the LRU.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key) -> Optional[CachedResponse]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry: CachedResponse):
+        with self.lock:
+            self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def _cache_control(max_age: int) -> str:
+    return f'public, max-age={max_age}' if max_age > 0 else 'no-cache'
+
+
+def _normalized_args() -> tuple:
+    """Query args as a sorted tuple, ignoring surrounding space and arg order."""
+    return tuple(sorted((key, value.strip()) for key, value in request.args.items(multi=True)))
+
+
+def _conditional_response(entry: CachedResponse, max_age: int) -> Response:
+    encoding = negotiate_encoding(request.accept_encodings) if len(entry.body) >= MIN_COMPRESS_SIZE else None
+    etag = entry.etag_for(encoding)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(entry.body_for(encoding), mimetype=entry.mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = _cache_control(max_age)
+    response.vary.add('Accept-Encoding')
+    response.vary.add('Accept')
+    return response
+
+
+def cached_response(version: Callable[[], Optional[Hashable]], max_age: int = DEFAULT_MAX_AGE,
+                    when: Optional[Callable[[], bool]] = None):
+    """Cache a GET view's 200 responses per data version.
+
+    `version` returns the current data version, or None to bypass the cache
+    (e.g. nothing is loaded yet).  `when` can exclude requests whose args
+    are too open-ended to be worth keeping, such as free-text searches.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            current = version()
+            if current is None or (when is not None and not when()):
+                return view(*args, **kwargs)
+
+            key = (request.path, _normalized_args(), response_format(), current)
+            entry = response_cache.get(key)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                entry = CachedResponse(response.get_data(), response.mimetype)
+                response_cache.put(key, entry)
+            return _conditional_response(entry, max_age)
+        return wrapper
+    return decorator
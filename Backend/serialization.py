@@ -0,0 +1,111 @@
+"""
+Response serialization shared by every API route.
+
+Uses orjson when it is installed (native NumPy scalars/arrays, NaN -> null,
+several times faster than the stdlib), and falls back to the stdlib encoder
+with the same output rules otherwise.  FastJSONProvider plugs this into
+Flask so jsonify() goes through it too.
+
+Routes that also speak MessagePack answer through api_response(), which
+picks the format from the Accept header when the optional `msgpack`
+package is installed.
+"""
+
+import json
+import math
+from datetime import date, datetime
+
+import numpy as np
+from flask import Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) \
+    if ORJSON_AVAILABLE else 0
+
+
+def _default(value):
+    """Types neither encoder handles natively (pandas Timestamps, sets, NumPy leftovers)."""
+    if isinstance(value, np.generic):
+        return _clean(value.item())
+    if isinstance(value, np.ndarray):
+        return _clean(value.tolist())
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _clean(value):
+    """Recursively turn NumPy values into Python ones and NaN/inf into None (stdlib path)."""
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def dumps(obj) -> bytes:
+    """Compact, key-sorted JSON bytes with NaN/inf written as null."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(_clean(obj), default=_default, sort_keys=True,
+                      separators=(',', ':'), allow_nan=False).encode('ascii')
+
+
+def packb(obj) -> bytes:
+    """MessagePack bytes following the JSON rules (NumPy values native, NaN/inf as nil)."""
+    return msgpack.packb(_clean(obj), default=_default)
+
+
+def response_format() -> str:
+    """Mimetype to answer the current request in; JSON unless MessagePack is preferred."""
+    if not MSGPACK_AVAILABLE:
+        return JSON_MIMETYPE
+    # JSON is listed first so it wins ties such as */* or a missing Accept header.
+    return request.accept_mimetypes.best_match((JSON_MIMETYPE, MSGPACK_MIMETYPE), JSON_MIMETYPE)
+
+
+def api_response(obj, status: int = 200) -> Response:
+    """`obj` as JSON or MessagePack, whichever the client asked for."""
+    if response_format() == MSGPACK_MIMETYPE:
+        response = Response(packb(obj), status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(obj)
+        response.status_code = status
+    response.vary.add('Accept')
+    return response
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with dumps() above."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return Response(dumps(obj) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,163 @@
+"""
+Team-level aggregates over the columnar PlayerStore.
+
+One grouped pass per data version: bincount over the team codes gives every
+team's totals and averages, and a stable sort of the PPG order by team code
+gives each roster already ranked, from which per-stat team leaders and the
+game-preview rosters are sliced.  Requests only look results up.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TEAM_IDS = {
+    "ATL":1610612737,"BOS":1610612738,"BKN":1610612751,"CHA":1610612766,
+    "CHI":1610612741,"CLE":1610612739,"DAL":1610612742,"DEN":1610612743,
+    "DET":1610612765,"GSW":1610612744,"HOU":1610612745,"IND":1610612754,
+    "LAC":1610612746,"LAL":1610612747,"MEM":1610612763,"MIA":1610612748,
+    "MIL":1610612749,"MIN":1610612750,"NOP":1610612740,"NYK":1610612752,
+    "OKC":1610612760,"ORL":1610612753,"PHI":1610612755,"PHX":1610612756,
+    "POR":1610612757,"SAC":1610612758,"SAS":1610612759,"TOR":1610612761,
+    "UTA":1610612762,"WAS":1610612764,
+}
+
+# Live NBA feeds use these tricodes; the season data uses Basketball Reference's.
+TEAM_ALIASES = {'BKN': 'BRK', 'PHX': 'PHO', 'CHA': 'CHO'}
+
+# stat key -> column; totals and averages are reported for these
+TEAM_STATS = (
+    ('ppg', 'PPG_LAST'),
+    ('apg', 'APG_LAST'),
+    ('rpg', 'RPG_LAST'),
+    ('spg', 'SPG_LAST'),
+    ('bpg', 'BPG_LAST'),
+    ('tov', 'TOV_LAST'),
+    ('mpg', 'MIN_LAST'),
+)
+
+# Averaged only; summing percentages or ages means nothing.
+AVERAGE_ONLY_STATS = (
+    ('fg_pct', 'FG_PCT_LAST'),
+    ('fg3_pct', 'FG3_PCT_LAST'),
+    ('ft_pct', 'FT_PCT_LAST'),
+    ('age', 'AGE'),
+)
+
+LEADER_STATS = ('ppg', 'rpg', 'apg', 'spg', 'bpg')
+TOP_PLAYERS = 5
+
+
+def is_team(label: str) -> bool:
+    """Real franchises only: not '' and not the '2TM'-style multi-team rows."""
+    return bool(label) and not label[0].isdigit()
+
+
+def _grouped(order: np.ndarray, codes: np.ndarray, n_groups: int):
+    """`order` regrouped by code (stable, so each group keeps `order`) plus group bounds."""
+    grouped = order[np.argsort(codes[order], kind='stable')]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=n_groups))))
+    return grouped, bounds
+
+
+class TeamAggregates:
+    def __init__(self, store):
+        self.store = store
+        codes = store.team_codes.astype(np.int64)
+        n_teams = len(store.team_labels)
+        counts = np.bincount(codes, minlength=n_teams)
+        safe_counts = np.maximum(counts, 1)
+
+        totals = {key: np.bincount(codes, weights=store.column(col), minlength=n_teams) for key, col in TEAM_STATS}
+        averages = {key: total / safe_counts for key, total in totals.items()}
+        for key, col in AVERAGE_ONLY_STATS:
+            averages[key] = np.bincount(codes, weights=store.column(col), minlength=n_teams) / safe_counts
+
+        roster_order, bounds = _grouped(store.order('ppg', descending=True), codes, n_teams)
+        self.rosters: Dict[str, np.ndarray] = {
+            label: roster_order[bounds[code]:bounds[code + 1]] for code, label in enumerate(store.team_labels)
+        }
+
+        leaders = {}
+        for key in LEADER_STATS:
+            grouped, _ = _grouped(store.order(key, descending=True), codes, n_teams)
+            leaders[key] = grouped[bounds[:-1]]
+
+        self.summaries: Dict[str, Dict] = {}
+        self.game_rosters: Dict[str, List[Dict]] = {}
+        for code, label in enumerate(store.team_labels):
+            if not is_team(label):
+                continue
+            self.summaries[label] = {
+                'team': label,
+                'players': int(counts[code]),
+                'totals': {key: round(float(totals[key][code]), 1) for key, _ in TEAM_STATS},
+                'averages': {key: round(float(values[code]), 3 if key.endswith('_pct') else 1)
+                             for key, values in averages.items()},
+                'leaders': {key: self._player(int(rows[code])) for key, rows in leaders.items()},
+                'top_players': [self._player(row) for row in self.rosters[label][:TOP_PLAYERS].tolist()],
+                'roster': [self._player(row) for row in self.rosters[label].tolist()],
+            }
+            self.game_rosters[label] = [self._game_player(row) for row in self.rosters[label].tolist()]
+
+    def resolve(self, tricode: str) -> Optional[str]:
+        """Season-data label for a tricode in either spelling, or None for unknown teams."""
+        tricode = (tricode or '').upper()
+        tricode = TEAM_ALIASES.get(tricode, tricode)
+        return tricode if tricode in self.summaries else None
+
+    def summary(self, tricode: str) -> Optional[Dict]:
+        label = self.resolve(tricode)
+        return None if label is None else self.summaries[label]
+
+    def game_roster(self, tricode: str) -> List[Dict]:
+        """Zeroed game roster with season averages, starters first (game previews)."""
+        label = self.resolve(tricode)
+        return [] if label is None else list(self.game_rosters[label])
+
+    def compare(self, a: str, b: str) -> Optional[Dict]:
+        first, second = self.summary(a), self.summary(b)
+        if first is None or second is None:
+            return None
+        edges = {}
+        for key in first['averages']:
+            diff = first['averages'][key] - second['averages'][key]
+            # Fewer turnovers is the better side.
+            better = -diff if key == 'tov' else diff
+            edges[key] = {
+                'difference': round(diff, 3 if key.endswith('_pct') else 1),
+                'edge': None if better == 0 or key == 'age' else (first['team'] if better > 0 else second['team']),
+            }
+        return {'a': first, 'b': second, 'comparison': edges}
+
+    def _player(self, row: int) -> Dict:
+        store = self.store
+        return {
+            'id': int(store.ids[row]),
+            'name': store.names[row],
+            'position': store.position_labels[store.position_codes[row]],
+            'ppg': round(float(store.column('PPG_LAST')[row]), 1),
+            'rpg': round(float(store.column('RPG_LAST')[row]), 1),
+            'apg': round(float(store.column('APG_LAST')[row]), 1),
+            'spg': round(float(store.column('SPG_LAST')[row]), 1),
+            'bpg': round(float(store.column('BPG_LAST')[row]), 1),
+        }
+
+    def _game_player(self, row: int) -> Dict:
+        store = self.store
+        return {
+            'personId':  int(store.ids[row]),
+            'name':      store.names[row],
+            'jerseyNum': '',
+            'position':  store.position_labels[store.position_codes[row]],
+            'status':    'ACTIVE',
+            'oncourt':   False,
+            # Game stats all zero (game hasn't started)
+            'pts': 0, 'reb': 0, 'ast': 0, 'stl': 0, 'blk': 0,
+            'fgm': 0, 'fga': 0, 'fg3m': 0, 'fg3a': 0,
+            'ftm': 0, 'fta': 0, 'tov': 0, 'min': '0m', 'plusMinus': 0,
+            # Season stats for context
+            'season_ppg': round(float(store.column('PPG_LAST')[row]), 1),
+            'season_rpg': round(float(store.column('RPG_LAST')[row]), 1),
+            'season_apg': round(float(store.column('APG_LAST')[row]), 1),
+        }
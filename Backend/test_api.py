@@ -3,7 +3,8 @@ Test script to verify the API endpoints work correctly
 """
 import requests
 import json
-from app import app, nba_data
+from app import app
+from dataset import dataset
 
 def test_api():
     """Test the API endpoints"""
@@ -44,7 +45,24 @@ def test_api():
         else:
             print(f"❌ Teams endpoint failed: {response.status_code}")
         
-        print(f"\n📊 Total NBA data available: {len(nba_data) if nba_data else 0} players")
+        records = dataset.records
+        print(f"\n📊 Total NBA data available: {len(records) if records else 0} players")
+
+def test_player_routes_accept_store_ids():
+    """Every id route must accept the ids the store hands out, fallback digests included."""
+    from app import load_nba_data
+    assert load_nba_data()
+    store = dataset.store
+    with app.test_client() as client:
+        for row in (0, store.size - 1):
+            player_id = int(store.ids[row])
+            response = client.get(f'/api/players/{player_id}')
+            assert response.status_code == 200
+            assert response.get_json()['id'] == player_id
+            for suffix in ('/percentiles', '/similar'):
+                assert client.get(f'/api/players/{player_id}{suffix}').status_code == 200
+            batch = client.get(f'/api/players/batch?ids={player_id}').get_json()
+            assert batch['found'] == 1
 
 if __name__ == "__main__":
     # Load the data first
@@ -0,0 +1,97 @@
+"""
+Tests for the memory-mapped columnar data format (run with: python -m pytest test_columnar_data.py)
+"""
+import os
+import pickle
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from columnar_data import ColumnarData, ColumnarRecords, columnar_path, load_player_data, write_columnar
+from dataset import Snapshot
+from player_store import build_player_store
+
+RECORDS = [
+    {'PLAYER_NAME': 'Nikola Jokić', 'TEAM': 'DEN', 'AGE': 30, 'PPG_LAST': 27.7, 'ACTIVE': True,
+     'TAGS': ['mvp'], 'NOTE': None},
+    {'PLAYER_NAME': 'Luka Dončić', 'TEAM': 'LAL', 'AGE': 26.5, 'PPG_LAST': 33.5, 'ACTIVE': False,
+     'TAGS': [], 'NOTE': 'trade'},
+    {'PLAYER_NAME': 'A.J. Green', 'AGE': 25, 'PPG_LAST': None, 'ACTIVE': True, 'TAGS': None},
+]
+
+
+@pytest.fixture
+def pkl_path(tmp_path):
+    path = str(tmp_path / 'season.pkl')
+    with open(path, 'wb') as f:
+        pickle.dump(RECORDS, f)
+    return path
+
+
+def test_round_trip_keeps_keys_order_and_types(tmp_path):
+    path = str(tmp_path / 'season.cols')
+    write_columnar(RECORDS, path)
+    records = ColumnarData(path).to_records()
+    assert records == RECORDS
+    assert [list(r) for r in records] == [list(r) for r in RECORDS]
+    # A column mixing ints and floats gives each row back its own type.
+    assert [type(r['AGE']) for r in records] == [int, float, int]
+
+
+def test_lazy_records_build_rows_on_demand(tmp_path):
+    path = str(tmp_path / 'season.cols')
+    write_columnar(RECORDS, path)
+    records = ColumnarRecords(ColumnarData(path))
+    assert len(records) == 3
+    assert records[1] == RECORDS[1]
+    assert records[-1] == RECORDS[-1]
+    assert records[:2] == RECORDS[:2]
+    assert records._all is None
+    assert list(records) == RECORDS
+    with pytest.raises(IndexError):
+        records[3]
+
+
+def test_field_reads_like_dict_get(tmp_path):
+    path = str(tmp_path / 'season.cols')
+    write_columnar(RECORDS, path)
+    data = ColumnarData(path)
+    assert data.field('TEAM', 'UNK') == ['DEN', 'LAL', 'UNK']
+    assert data.field('NOTE', 'x') == [None, 'trade', 'x']
+    assert data.field('MISSING', 0) == [0, 0, 0]
+
+
+def test_load_prefers_a_current_columnar_file(pkl_path):
+    write_columnar(RECORDS, columnar_path(pkl_path))
+    records, data = load_player_data(pkl_path)
+    assert isinstance(records, ColumnarRecords) and data is not None
+    assert list(records) == RECORDS
+
+
+def test_corrupt_columnar_file_falls_back_to_the_pickle(pkl_path):
+    cols = columnar_path(pkl_path)
+    with open(cols, 'wb') as f:
+        f.write(b'not a columnar file')
+    os.utime(cols, ns=(os.stat(pkl_path).st_mtime_ns + 10**9,) * 2)
+    records, data = load_player_data(pkl_path)
+    assert data is None
+    assert records == RECORDS
+
+
+def test_store_from_columns_matches_store_from_dicts(pkl_path):
+    write_columnar(RECORDS, columnar_path(pkl_path))
+    records, data = load_player_data(pkl_path)
+    mapped = build_player_store(records, ['DEN', 'LAL'], data)
+    plain = build_player_store(RECORDS, ['DEN', 'LAL'])
+    assert mapped.summary_json == plain.summary_json
+    assert mapped.ids.tolist() == plain.ids.tolist()
+    assert mapped.teams.game_rosters == plain.teams.game_rosters
+    assert records._all is None
+
+
+def test_frame_is_read_from_the_columns(pkl_path):
+    write_columnar(RECORDS, columnar_path(pkl_path))
+    records, data = load_player_data(pkl_path)
+    assert_frame_equal(Snapshot(records, None, data).frame(), pd.DataFrame(RECORDS))
+    assert records._all is None
@@ -0,0 +1,179 @@
+"""
+Tests for the columnar player store (run with: python -m pytest test_player_store.py)
+"""
+import base64
+import json
+import re
+
+import numpy as np
+import pytest
+
+from player_search import edit_distance
+from player_store import (MAX_WHERE_CONDITIONS, MAX_WHERE_LENGTH, build_player_store, decode_cursor, encode_cursor,
+                          parse_where)
+
+RECORDS = [
+    {'PLAYER_ID': i, 'PLAYER_NAME': f'Player {i:02d}', 'TEAM': 'DEN' if i % 2 else 'BOS', 'POSITION': 'G',
+     'PPG_LAST': float(i % 4), 'AGE': 20 + i, 'FG3_PCT_LAST': round(0.33 + i / 100, 2)}
+    for i in range(1, 12)
+]
+
+
+@pytest.fixture(scope='module')
+def store():
+    return build_player_store(RECORDS, ['DEN', 'BOS'])
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _walk(store, sort_by, descending, limit, mask=None):
+    """Follow cursors page by page, as a client would, and collect the ids."""
+    mask = np.ones(store.size, dtype=bool) if mask is None else mask
+    ids, after = [], None
+    while True:
+        rows, more = store.keyset_page(mask, sort_by, descending, after, limit)
+        ids.extend(int(store.ids[r]) for r in rows)
+        if not more:
+            return ids
+        last = int(rows[-1])
+        _, _, after = decode_cursor(encode_cursor(sort_by, descending, store.sort_value(sort_by, last),
+                                                  int(store.ids[last])))
+
+
+def _where_ids(store, where):
+    return [int(i) for i in store.ids[store.where_mask(parse_where(where))]]
+
+
+def _ids(predicate):
+    return [r['PLAYER_ID'] for r in RECORDS if predicate(r)]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor('ppg', True, 12.5, 42)) == ('ppg', True, (12.5, 42))
+    assert decode_cursor(encode_cursor('name', False, 'lebron james', 7)) == ('name', False, ('lebron james', 7))
+
+
+@pytest.mark.parametrize('payload', [
+    {'k': [], 'd': 1, 'v': 1, 'i': 1},
+    {'k': 'nope', 'd': 1, 'v': 1, 'i': 1},
+    {'k': 'ppg', 'd': 1, 'v': 'abc', 'i': 1},
+    {'k': 'ppg', 'd': 1, 'v': True, 'i': 1},
+    {'k': 'ppg', 'd': 1, 'v': None, 'i': 1},
+    {'k': 'name', 'd': 0, 'v': 3, 'i': 1},
+    {'k': 'ppg', 'd': 1, 'v': 1, 'i': 'x'},
+    {'k': 'ppg', 'd': 1, 'v': 1},
+])
+def test_malformed_cursors_are_rejected(payload):
+    assert decode_cursor(_raw_cursor(payload)) is None
+
+
+def test_garbage_cursor_is_rejected():
+    assert decode_cursor('not-base64!!') is None
+
+
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('limit', [1, 3, 20])
+def test_keyset_walk_visits_every_row_once_in_order(store, descending, limit):
+    expected = [r['PLAYER_ID'] for r in sorted(RECORDS, key=lambda r: (r['PPG_LAST'], r['PLAYER_ID']),
+                                               reverse=descending)]
+    assert _walk(store, 'ppg', descending, limit) == expected
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_keyset_walk_by_name_respects_mask(store, descending):
+    mask = store.team_mask('DEN')
+    expected = sorted((r['PLAYER_ID'] for r in RECORDS if r['TEAM'] == 'DEN'), reverse=descending)
+    assert _walk(store, 'name', descending, 2, mask) == expected
+
+
+def test_team_suggestions_use_labels_that_filter():
+    records = [
+        {'PLAYER_NAME': 'Cam Thomas', 'TEAM': 'BRK', 'POSITION': 'SG', 'PPG_LAST': 24.0},
+        {'PLAYER_NAME': 'Dennis Schröder', 'TEAM': '2TM', 'POSITION': 'PG', 'PPG_LAST': 13.0},
+    ]
+    store = build_player_store(records, ['BKN', 'BOS', 'PHX'])
+    teams = sorted(s['label'] for prefix in 'bp2' for s in store.autocomplete(prefix, 20) if s['type'] == 'team')
+    assert teams == ['BOS', 'BRK', 'PHO']
+    assert store.filter_mask(team='BRK').any()
+
+
+def test_fuzzy_word_distances_share_one_budget():
+    store = build_player_store([{'PLAYER_NAME': 'Stephen Curry'}, {'PLAYER_NAME': 'Shai Gilgeous-Alexander'}])
+    assert store.fuzzy_rows('stphen cury', 2) == [(0, 2)]
+    assert store.fuzzy_rows('gilgeous alexnder shai', 2) == [(1, 1)]
+    # 'steph' -> 'stephen' (2) plus 'cury' -> 'curry' (1) is over the cap.
+    assert store.fuzzy_rows('steph cury', 2) == []
+    assert all(d <= 1 for _, d in store.fuzzy_rows('stphen cury', 1))
+
+
+def test_where_strict_and_inclusive_bounds(store):
+    assert _where_ids(store, 'ppg>2') == _ids(lambda r: r['PPG_LAST'] > 2)
+    assert _where_ids(store, 'ppg>=2') == _ids(lambda r: r['PPG_LAST'] >= 2)
+    assert _where_ids(store, 'ppg<1') == _ids(lambda r: r['PPG_LAST'] < 1)
+    assert _where_ids(store, 'ppg<=1') == _ids(lambda r: r['PPG_LAST'] <= 1)
+    assert _where_ids(store, 'ppg=2') == _where_ids(store, 'ppg==2') == _ids(lambda r: r['PPG_LAST'] == 2)
+
+
+def test_where_takes_percentages_as_fractions(store):
+    assert parse_where('fg3_pct>=38') == parse_where('fg3_pct>=0.38') == [('fg3_pct', 0.38, np.inf)]
+    assert _where_ids(store, 'fg3_pct>=38') == _ids(lambda r: r['FG3_PCT_LAST'] >= 0.38)
+
+
+def test_where_intersects_repeated_keys(store):
+    assert parse_where('age>=22, age<25, age>=23') == [('age', 23.0, np.nextafter(25.0, -np.inf))]
+    assert _where_ids(store, 'age>=22,age<25,age>=23,ppg>0') == _ids(lambda r: 23 <= r['AGE'] < 25 and r['PPG_LAST'] > 0)
+    assert _where_ids(store, 'age>25,age<25') == []
+
+
+def test_empty_where_keeps_every_row(store):
+    assert parse_where('') == []
+    assert _where_ids(store, '') == [r['PLAYER_ID'] for r in RECORDS]
+
+
+@pytest.mark.parametrize('where, message', [
+    ('ppg>>3', 'Invalid where condition: ppg>>3'),
+    ('ppg>=abc', 'Invalid where condition: ppg>=abc'),
+    ('name=3', 'Unknown where field: name'),
+    ('steals>1', 'Unknown where field: steals'),
+    (','.join(['ppg>1'] * (MAX_WHERE_CONDITIONS + 1)), f'At most {MAX_WHERE_CONDITIONS} where conditions'),
+    ('ppg>=1,age>=' + '2' * MAX_WHERE_LENGTH, f'where must be at most {MAX_WHERE_LENGTH} characters'),
+])
+def test_bad_where_raises_with_a_message(where, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        parse_where(where)
+
+
+def test_leaders_accept_either_team_spelling():
+    records = [{'PLAYER_NAME': f'Net {i}', 'TEAM': 'BRK', 'PPG_LAST': float(i)} for i in range(3)]
+    store = build_player_store(records + [{'PLAYER_NAME': 'Sun', 'TEAM': 'PHO', 'PPG_LAST': 30.0}])
+    assert store.leaders.leaderboard('ppg', 5, team='BKN') == store.leaders.leaderboard('ppg', 5, team='BRK')
+    assert [p['name'] for p in store.leaders.leaderboard('ppg', 5, team='BKN')] == ['Net 2', 'Net 1', 'Net 0']
+
+
+def test_top_pra_player_uses_the_store_id():
+    store = build_player_store([{'PLAYER_NAME': 'A', 'PPG_LAST': 10.0}, {'PLAYER_NAME': 'B', 'PPG_LAST': 20.0}])
+    best = store.leaders.top_pra_player()
+    assert best['name'] == 'B'
+    assert best['player_id'] == int(store.ids[1]) == store.leaders.leaderboard('pra', 1)[0]['id']
+
+
+@pytest.mark.parametrize('a, b, max_distance, expected', [
+    ('curry', 'curry', 2, 0),
+    ('cury', 'curry', 2, 1),
+    ('jmaes', 'james', 2, 1),
+    ('stph', 'stephen', 2, 3),
+    ('lebron', 'lebron james', 2, 3),
+    ('abcdef', 'badcfe', 2, 3),
+    ('abcdef', 'badcfe', 3, 3),
+    ('', 'ab', 2, 2),
+])
+def test_edit_distance_is_exact_within_budget_and_capped_beyond(a, b, max_distance, expected):
+    assert edit_distance(a, b, max_distance) == expected
+
+
+def test_fuzzy_whole_name_match_skips_word_matches():
+    store = build_player_store([{'PLAYER_NAME': 'LeBron James'}, {'PLAYER_NAME': 'James Lebron'}])
+    assert store.fuzzy_rows('lebron jmaes', 2) == [(0, 1)]
+    assert store.fuzzy_rows('jmaes lebron shai', 2) == []
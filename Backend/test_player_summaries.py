@@ -0,0 +1,45 @@
+"""
+Tests for the precomputed player summaries (run with: python -m pytest test_player_summaries.py)
+"""
+import os
+import subprocess
+import sys
+
+from player_store import build_player_store
+from player_summaries import get_player_stats_summary, name_id
+
+RECORDS = [
+    {'PLAYER_ID': 1, 'PLAYER_NAME': 'Nikola Jokić', 'TEAM': 'DEN', 'POSITION': 'C', 'AGE': 30, 'PPG_LAST': 29.6,
+     'APG_LAST': 10.2, 'RPG_LAST': 12.7, 'FG_PCT_LAST': 0.576, 'FG3_PCT_LAST': 0.417, 'GAMES_PLAYED_LAST': 70,
+     'PPG_TREND': 1.25},
+    {'player_name': 'Jalen Brunson', 'team': 'NYK', 'position': 'PG', 'ppg_last': 26.0, 'apg_last': 7.3,
+     'ft_pct_last': 0.82, 'consistency_score': 0.5},
+    {'PLAYER_NAME': 'A.J. Green', 'PPG_LAST': 7.45, 'CONSISTENCY_SCORE': 0.813},
+]
+
+
+def test_fallback_id_is_the_same_in_every_process():
+    code = "from player_summaries import name_id; print(name_id('A.J. Green'))"
+    here = os.path.dirname(os.path.abspath(__file__))
+    ids = {
+        subprocess.run([sys.executable, '-c', code], cwd=here, capture_output=True, text=True,
+                       env=dict(os.environ, PYTHONHASHSEED=seed)).stdout.strip()
+        for seed in ('1', '2')
+    }
+    assert ids == {str(name_id('A.J. Green'))}
+
+
+def test_fallback_id_ignores_case_and_spacing():
+    assert name_id('  A.J.  green ') == name_id('A.J. Green')
+
+
+def test_player_id_wins_over_fallback():
+    store = build_player_store([{'PLAYER_ID': 7, 'PLAYER_NAME': 'Bam Adebayo'}, {'PLAYER_NAME': 'A.J. Green'}])
+    assert store.ids.tolist() == [7, name_id('A.J. Green')]
+
+
+def test_materialized_summaries_match_the_per_record_builder():
+    store = build_player_store(RECORDS, ['DEN', 'NYK'])
+    expected = [get_player_stats_summary(record, summary['percentiles'])
+                for record, summary in zip(RECORDS, store.summaries)]
+    assert store.summaries == expected
@@ -0,0 +1,104 @@
+"""
+Tests for the versioned response cache (run with: python -m pytest test_response_cache.py)
+"""
+import gzip
+
+from flask import Flask, jsonify, request
+
+from compression import MIN_COMPRESS_SIZE
+from response_cache import ResponseCache, cached_response, response_cache
+
+versions = {'data': 1, 'feed': ('feed', 1)}
+calls = []
+
+app = Flask(__name__)
+
+
+@app.route('/data')
+@cached_response(lambda: versions['data'])
+def data_route():
+    calls.append('data')
+    return jsonify({'version': versions['data'], 'q': request.args.get('q', '')})
+
+
+@app.route('/feed')
+@cached_response(lambda: versions['feed'])
+def feed_route():
+    calls.append('feed')
+    return jsonify({'version': list(versions['feed'])})
+
+
+@app.route('/big')
+@cached_response(lambda: versions['data'])
+def big_route():
+    calls.append('big')
+    return jsonify({'rows': ['x' * 32] * (MIN_COMPRESS_SIZE // 32)})
+
+
+def setup_function():
+    response_cache.clear()
+    calls.clear()
+    versions.update(data=1, feed=('feed', 1))
+
+
+def test_repeat_requests_hit_the_cache():
+    client = app.test_client()
+    first = client.get('/data?q=x')
+    second = client.get('/data?q=x')
+    assert first.get_data() == second.get_data()
+    assert calls == ['data']
+
+
+def test_new_version_misses_without_clearing_other_routes():
+    client = app.test_client()
+    client.get('/data')
+    client.get('/feed')
+    versions['feed'] = ('feed', 2)
+    client.get('/feed')
+    client.get('/data')
+    assert calls == ['data', 'feed', 'feed']
+    assert len(response_cache.entries) == 3
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ResponseCache(max_entries=2)
+    for key in ('a', 'b'):
+        cache.put(key, object())
+    cache.get('a')
+    cache.put('c', object())
+    assert list(cache.entries) == ['a', 'c']
+
+
+def test_each_encoding_has_its_own_etag():
+    client = app.test_client()
+    plain = client.get('/big')
+    packed = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    assert plain.headers.get('Content-Encoding') is None
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.get_data()) == plain.get_data()
+    assert packed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+    assert 'Accept-Encoding' in packed.headers['Vary']
+    assert calls == ['big']
+
+
+def test_matching_etag_gets_304_only_for_its_encoding():
+    client = app.test_client()
+    plain_etag = client.get('/big').headers['ETag']
+    gzip_etag = client.get('/big', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    not_modified = client.get('/big', headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzip_etag})
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b''
+    assert not_modified.headers['ETag'] == gzip_etag
+    assert client.get('/big', headers={'If-None-Match': plain_etag}).status_code == 304
+
+    # A validator for one representation must not revalidate the other.
+    assert client.get('/big', headers={'If-None-Match': gzip_etag}).status_code == 200
+    assert client.get('/big', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain_etag}).status_code == 200
+    assert calls == ['big']
+
+
+def test_small_bodies_are_not_compressed():
+    response = app.test_client().get('/data', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') is None
+    assert not response.headers['ETag'].endswith('-gzip"')
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is configured at import time, so with gunicorn's preload_app the
+season data, its indexes and the AI model are loaded once in the master
+and shared by the forked workers.
+"""
+
+from app import configure_app
+
+app = configure_app(watch_data=False)